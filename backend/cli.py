@@ -1,28 +1,68 @@
 import asyncio
 import csv
+import json
 import os
+import socket
+import time
 from collections import defaultdict
-from collections.abc import Collection, Iterable, Mapping
+from collections.abc import AsyncGenerator, Collection, Iterable, Mapping
+from contextlib import asynccontextmanager
 from dataclasses import asdict
 from io import StringIO
+from pathlib import Path
 from typing import Annotated, Any
 
 import anyio
 import typer
+import uvicorn
+from beanie import PydanticObjectId
+from fastapi_injector import RequestScopeFactory
+from h2.config import H2Configuration
+from h2.connection import H2Connection
+from h2.events import RequestReceived
+from httpx import AsyncClient, AsyncHTTPTransport, HTTPError, Limits
 from injector import ClassAssistedBuilder, inject
 from rich import print  # noqa: A004
 from rich.console import Console
 from rich.pretty import pprint
 from rich.table import Table
+from starlette.types import Receive, Scope, Send
 
+from trackline.core.db.client import DatabaseClient
+from trackline.core.metrics import Metrics
+from trackline.core.settings import Settings
+from trackline.core.use_cases import UseCaseExecutor
+from trackline.core.utils.http import create_timeout, create_transport
 from trackline.di import injector
+from trackline.games.models import (
+    ArtistsMatchMode,
+    Game,
+    GameSettings,
+    Player,
+    Playlist,
+    TitleMatchMode,
+)
 from trackline.games.services.music_brainz_lookup import MusicBrainzLookup
+from trackline.games.services.track_cache import TrackCache
+from trackline.games.services.track_catalog import CatalogPlaylist, FileTrackCatalog
+from trackline.games.services.track_fetcher import TrackFetcher
 from trackline.games.services.track_metadata_parser import (
     TrackMetadata,
     TrackMetadataParser,
 )
+from trackline.games.use_cases.replenish_track_cache import ReplenishTrackCache
 from trackline.spotify.models import SpotifyTrack
+from trackline.spotify.services.auth_provider import SpotifyAuthProvider
+from trackline.spotify.services.http_client import SpotifyHttpClient
+from trackline.spotify.services.response_parser import (
+    PLAYLIST_ITEMS_FIELDS,
+    parse_playlist_items,
+)
 from trackline.spotify.services.spotify_client import SpotifyClient, SpotifyUserClient
+from trackline.spotify.services.track_cache import SpotifyTrackStore
+from trackline.standins.common import StandInBehavior
+from trackline.standins.musicbrainz import create_musicbrainz_app
+from trackline.standins.spotify import create_spotify_app
 
 app = typer.Typer()
 
@@ -31,26 +71,38 @@ class MusicbrainzTrackLookupCli:
     @inject
     def __init__(
         self,
+        db_client: DatabaseClient,
+        request_scope_factory: RequestScopeFactory,
         mb_lookup: MusicBrainzLookup,
         spotify_client: SpotifyClient,
         track_metadata_parser: TrackMetadataParser,
     ) -> None:
+        self._db_client = db_client
+        self._request_scope_factory = request_scope_factory
         self._mb_lookup = mb_lookup
         self._track_metadata_parser = track_metadata_parser
         self._spotify_client = spotify_client
 
-    async def run(self, track_id: str) -> None:
-        async with self._spotify_client:
-            track = await self._spotify_client.get_track(track_id)
+    async def run(self, track_ids: list[str]) -> None:
+        await self._db_client.initialize()
 
-        metadata = self._track_metadata_parser.parse(track.artists, track.title)
-        mb_release_year = await self._mb_lookup.get_release_year(metadata)
+        async with self._spotify_client, self._request_scope_factory.create_scope():
+            track_store = injector.get(SpotifyTrackStore)
+            tracks = await track_store.get_tracks(track_ids)
 
-        grid = Table.grid(padding=(0, 2))
-        grid.add_row("Original title:", track.title)
-        grid.add_row("Cleaned title:", metadata.clean_title)
-        grid.add_row("Release year:", str(mb_release_year))
-        print(grid)
+        for track_id, track in zip(track_ids, tracks, strict=True):
+            if not track:
+                print(f"Track {track_id} was not found.")
+                continue
+
+            metadata = self._track_metadata_parser.parse(track.artists, track.title)
+            mb_release_year = await self._mb_lookup.get_release_year(metadata)
+
+            grid = Table.grid(padding=(0, 2))
+            grid.add_row("Original title:", track.title)
+            grid.add_row("Cleaned title:", metadata.clean_title)
+            grid.add_row("Release year:", str(mb_release_year))
+            print(grid)
 
 
 class MusicbrainzPlaylistLookupCli:
@@ -95,8 +147,6 @@ class MusicbrainzPlaylistLookupCli:
 
             writer.writerow(self._format_row(track, metadata, mb_release_year))
 
-            await asyncio.sleep(1)
-
         async with await anyio.open_file(file_name, "w") as csv_file:
             await csv_file.write(buffer.getvalue())
 
@@ -134,28 +184,40 @@ class TrackMetadataParserCli:
     @inject
     def __init__(
         self,
+        db_client: DatabaseClient,
+        request_scope_factory: RequestScopeFactory,
         spotify_client: SpotifyClient,
         track_metadata_parser: TrackMetadataParser,
     ) -> None:
+        self._db_client = db_client
+        self._request_scope_factory = request_scope_factory
         self._spotify_client = spotify_client
         self._track_metadata_parser = track_metadata_parser
 
-    async def run(self, track_id: str) -> None:
-        async with self._spotify_client:
-            track = await self._spotify_client.get_track(track_id)
-
-        metadata = self._track_metadata_parser.parse(track.artists, track.title)
-
-        print("Original information")
-        pprint(track.model_dump())
-        print()
-        print("Parsed metadata")
-        pprint(
-            {
-                **asdict(metadata),
-                "clean_title": metadata.clean_title,
-            }
-        )
+    async def run(self, track_ids: list[str]) -> None:
+        await self._db_client.initialize()
+
+        async with self._spotify_client, self._request_scope_factory.create_scope():
+            track_store = injector.get(SpotifyTrackStore)
+            tracks = await track_store.get_tracks(track_ids)
+
+        for track_id, track in zip(track_ids, tracks, strict=True):
+            if not track:
+                print(f"Track {track_id} was not found.")
+                continue
+
+            metadata = self._track_metadata_parser.parse(track.artists, track.title)
+
+            print("Original information")
+            pprint(track.model_dump())
+            print()
+            print("Parsed metadata")
+            pprint(
+                {
+                    **asdict(metadata),
+                    "clean_title": metadata.clean_title,
+                }
+            )
 
 
 class PlaylistTrackDeduplicatorCli:
@@ -170,26 +232,24 @@ class PlaylistTrackDeduplicatorCli:
 
     async def run(self, playlist_id: str, access_token: str, *, dry_run: bool) -> None:
         print(f"Fetching playlist {playlist_id} from Spotify...")
-        async with self._spotify_client_builder.build(
-            access_token=access_token
-        ) as spotify_client:
-            tracks = await spotify_client.get_playlist_tracks(playlist_id)
-
-            duplicate_tracks: list[SpotifyTrack] = []
-            for tracks_group in self._group_tracks(tracks):
-                sorted_tracks_group = sorted(
-                    tracks_group, key=lambda t: t.release_year or 0
-                )
-                duplicate_tracks += sorted_tracks_group[1:]
+        spotify_client = self._spotify_client_builder.build(access_token=access_token)
+        tracks = await spotify_client.get_playlist_tracks(playlist_id)
 
-            print("Deleting duplicate tracks from playlist...")
-            await asyncio.sleep(5)
-            await self._delete_tracks_from_playlist(
-                spotify_client,
-                playlist_id,
-                duplicate_tracks,
-                dry_run=dry_run,
+        duplicate_tracks: list[SpotifyTrack] = []
+        for tracks_group in self._group_tracks(tracks):
+            sorted_tracks_group = sorted(
+                tracks_group, key=lambda t: t.release_year or 0
             )
+            duplicate_tracks += sorted_tracks_group[1:]
+
+        print("Deleting duplicate tracks from playlist...")
+        await asyncio.sleep(5)
+        await self._delete_tracks_from_playlist(
+            spotify_client,
+            playlist_id,
+            duplicate_tracks,
+            dry_run=dry_run,
+        )
 
     def _group_tracks(self, tracks: list[SpotifyTrack]) -> list[list[SpotifyTrack]]:
         grouped_tracks: dict[tuple[str, tuple[str, ...]], list[SpotifyTrack]] = (
@@ -233,11 +293,430 @@ class PlaylistTrackDeduplicatorCli:
             print(f"Removed {len(tracks)} duplicate tracks.")
 
 
+class ReplenishTrackCacheBenchmarkCli:
+    @inject
+    def __init__(
+        self,
+        db_client: DatabaseClient,
+        request_scope_factory: RequestScopeFactory,
+        spotify_client: SpotifyClient,
+        track_cache: TrackCache,
+        metrics: Metrics,
+    ) -> None:
+        self._db_client = db_client
+        self._request_scope_factory = request_scope_factory
+        self._spotify_client = spotify_client
+        self._track_cache = track_cache
+        self._metrics = metrics
+
+    async def run(
+        self,
+        playlist_ids: list[str],
+        market: str,
+        player_count: int,
+        runs: int,
+    ) -> None:
+        await self._db_client.initialize()
+
+        async with self._spotify_client:
+            game = await self._create_game(playlist_ids, market, player_count)
+            if not game.id:
+                raise ValueError("The game must have an id")
+
+            table = Table("Run", "Spotify requests", "Tracks", "Duration (ms)")
+            for run in range(runs):
+                self._track_cache.clear(game.id)
+
+                start_requests = self._metrics.get("spotify.requests")
+                start_time = time.perf_counter()
+                await self._replenish_track_cache(game)
+                duration = (time.perf_counter() - start_time) * 1000
+                requests = self._metrics.get("spotify.requests") - start_requests
+
+                table.add_row(
+                    str(run + 1),
+                    f"{requests:.0f}",
+                    str(self._track_cache.size(game.id)),
+                    f"{duration:.2f}",
+                )
+
+        print(table)
+
+    async def _create_game(
+        self,
+        playlist_ids: list[str],
+        market: str,
+        player_count: int,
+    ) -> Game:
+        playlists = [
+            Playlist(
+                spotify_id=playlist_id,
+                track_count=await self._spotify_client.get_playlist_total_tracks(
+                    playlist_id,
+                    market=market,
+                ),
+            )
+            for playlist_id in playlist_ids
+        ]
+
+        # The game is never persisted, it only provides the settings to the use case
+        return Game(
+            id=PydanticObjectId(),
+            join_code="BENCH",
+            settings=GameSettings(
+                spotify_market=market,
+                playlists=playlists,
+                initial_tokens=2,
+                max_tokens=5,
+                timeline_length=10,
+                guess_timeout=30000,
+                artists_match_mode=ArtistsMatchMode.ONE,
+                title_match_mode=TitleMatchMode.MAIN,
+                credits_similarity_threshold=0.9,
+                credits_filter_stop_words=True,
+                credits_convert_numbers=True,
+                enable_catchup=True,
+            ),
+            players=[Player(user_id=PydanticObjectId()) for _ in range(player_count)],
+        )
+
+    async def _replenish_track_cache(self, game: Game) -> None:
+        async with self._request_scope_factory.create_scope():
+            executor = injector.get(UseCaseExecutor)
+            await executor.execute(
+                ReplenishTrackCache(game=game, exclude=frozenset()),
+            )
+
+
+class TrackCatalogExportCli:
+    @inject
+    def __init__(
+        self,
+        db_client: DatabaseClient,
+        request_scope_factory: RequestScopeFactory,
+        spotify_client: SpotifyClient,
+    ) -> None:
+        self._db_client = db_client
+        self._request_scope_factory = request_scope_factory
+        self._spotify_client = spotify_client
+
+    async def run(
+        self,
+        playlist_ids: list[str],
+        market: str | None,
+        output: Path,
+    ) -> None:
+        await self._db_client.initialize()
+
+        playlists: dict[tuple[str, str | None], CatalogPlaylist] = {}
+        async with self._spotify_client:
+            for playlist_id in playlist_ids:
+                print(f"Exporting playlist {playlist_id}...")
+                playlists[playlist_id, market] = await self._export_playlist(
+                    playlist_id, market
+                )
+
+        FileTrackCatalog.write(output, playlists)
+
+        track_count = sum(len(p.tracks) for p in playlists.values())
+        print(f"Exported {track_count} track(s) to {output}")
+
+    async def _export_playlist(
+        self,
+        playlist_id: str,
+        market: str | None,
+    ) -> CatalogPlaylist:
+        sp_playlist = await self._spotify_client.get_playlist(
+            playlist_id,
+            market=market,
+        )
+        sp_tracks = await self._spotify_client.get_playlist_tracks(
+            playlist_id,
+            market=market,
+        )
+        usable_tracks = list(
+            {t.id: t for t in sp_tracks if t.is_playable and t.release_year}.values()
+        )
+
+        async with self._request_scope_factory.create_scope():
+            track_fetcher = injector.get(TrackFetcher)
+            tracks = await track_fetcher.create_tracks(usable_tracks)
+
+        # Catalog tracks are served as validated, so tracks whose release year could
+        # not be looked up on MusicBrainz are left out
+        if skipped_count := sum(not t.is_validated for t in tracks):
+            print(
+                f"Skipped {skipped_count} track(s) of playlist {playlist_id}, "
+                "as their release year could not be validated"
+            )
+
+        return CatalogPlaylist(
+            snapshot_id=sp_playlist.snapshot_id,
+            tracks=[
+                sp_track.model_copy(update={"release_year": track.track.release_year})
+                for sp_track, track in zip(usable_tracks, tracks, strict=True)
+                if track.is_validated
+            ],
+        )
+
+
+class SpotifyParserBenchmarkCli:
+    @inject
+    def __init__(
+        self,
+        auth_provider: SpotifyAuthProvider,
+        http_client: SpotifyHttpClient,
+    ) -> None:
+        self._auth_provider = auth_provider
+        self._http_client = http_client
+
+    async def run(
+        self,
+        payload_path: Path,
+        runs: int,
+        playlist_id: str | None,
+        market: str | None,
+    ) -> None:
+        if playlist_id:
+            print(f"Recording items of playlist {playlist_id}...")
+            async with self._http_client:
+                await self._record_payload(payload_path, playlist_id, market)
+
+        async with await anyio.open_file(payload_path, "rb") as payload_file:
+            content = await payload_file.read()
+
+        table = Table("Run", "Tracks", "Decoding (ms)", "Parsing (ms)", "Tracks/s")
+        for run in range(runs):
+            start_time = time.perf_counter()
+            json.loads(content)
+            decoding_duration = time.perf_counter() - start_time
+
+            start_time = time.perf_counter()
+            tracks, _ = parse_playlist_items(content)
+            parsing_duration = time.perf_counter() - start_time
+
+            table.add_row(
+                str(run + 1),
+                str(len(tracks)),
+                f"{decoding_duration * 1000:.2f}",
+                f"{parsing_duration * 1000:.2f}",
+                f"{len(tracks) / parsing_duration:.0f}",
+            )
+
+        print(table)
+
+    async def _record_payload(
+        self,
+        payload_path: Path,
+        playlist_id: str,
+        market: str | None,
+    ) -> None:
+        # Merge all pages into a single payload in the format of one page
+        access_token = await self._auth_provider.get_server_access_token()
+        items: list[Any] = []
+        while True:
+            response = await self._http_client.get(
+                f"playlists/{playlist_id}/items",
+                headers={"Authorization": f"Bearer {access_token.access_token}"},
+                params={
+                    "fields": PLAYLIST_ITEMS_FIELDS,
+                    "offset": str(len(items)),
+                    "limit": str(SpotifyClient.MAX_LIMIT),
+                    "market": market,
+                },
+            )
+            response.raise_for_status()
+
+            page = response.json()
+            items += page["items"]
+            if not page["items"] or len(items) >= page["total"]:
+                break
+
+        async with await anyio.open_file(payload_path, "w") as payload_file:
+            await payload_file.write(json.dumps({"items": items, "total": len(items)}))
+
+
+class HttpClientBenchmarkCli:
+    @inject
+    def __init__(self, settings: Settings) -> None:
+        self._settings = settings
+
+    async def run(
+        self,
+        url: str | None,
+        request_count: int,
+        concurrency: int,
+        latency: float,
+    ) -> None:
+        pool_limits = Limits(
+            max_connections=concurrency,
+            max_keepalive_connections=concurrency,
+        )
+        async with (
+            self._serve_stub(url, latency) as http1_url,
+            self._serve_http2_stub(url, latency) as http2_url,
+        ):
+            table = Table(
+                "Client",
+                "Requests",
+                "Errors",
+                "Connections",
+                "Duration (ms)",
+                "Requests/s",
+            )
+            # The local HTTP/2 stub doesn't use TLS, so clients have to speak HTTP/2
+            # right away instead of negotiating it
+            clients = {
+                "httpx defaults": (http1_url, AsyncHTTPTransport()),
+                "settings": (http1_url, create_transport(self._settings)),
+                f"keep-alive pool of {concurrency}": (
+                    http1_url,
+                    AsyncHTTPTransport(limits=pool_limits),
+                ),
+                "HTTP/2": (
+                    http2_url,
+                    AsyncHTTPTransport(http1=url is not None, http2=True),
+                ),
+            }
+            for name, (client_url, transport) in clients.items():
+                async with AsyncClient(
+                    timeout=create_timeout(self._settings), transport=transport
+                ) as client:
+                    error_count, connection_count, duration = await self._send_requests(
+                        client, client_url, request_count, concurrency
+                    )
+
+                table.add_row(
+                    name,
+                    str(request_count),
+                    str(error_count),
+                    str(connection_count),
+                    f"{duration * 1000:.2f}",
+                    f"{request_count / duration:.0f}",
+                )
+
+        print(table)
+
+    @asynccontextmanager
+    async def _serve_stub(
+        self,
+        url: str | None,
+        latency: float,
+    ) -> AsyncGenerator[str]:
+        if url:
+            yield url
+            return
+
+        async def app(scope: Scope, receive: Receive, send: Send) -> None:
+            if scope["type"] != "http":
+                return
+
+            await asyncio.sleep(latency / 1000)
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 200,
+                    "headers": [(b"content-type", b"application/json")],
+                }
+            )
+            await send({"type": "http.response.body", "body": b"{}"})
+
+        # Connections are queued by the listening socket until the server accepts them.
+        # Accepted connections inherit TCP_NODELAY, as responses are written in two
+        # parts, which would otherwise be delayed on reused connections.
+        sock = socket.socket()
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.bind(("127.0.0.1", 0))
+        sock.listen()
+        host, port = sock.getsockname()
+
+        server = uvicorn.Server(
+            uvicorn.Config(app, lifespan="off", log_level="warning")
+        )
+        server_task = asyncio.create_task(server.serve(sockets=[sock]))
+        try:
+            yield f"http://{host}:{port}/"
+        finally:
+            server.should_exit = True
+            await server_task
+
+    @asynccontextmanager
+    async def _serve_http2_stub(
+        self,
+        url: str | None,
+        latency: float,
+    ) -> AsyncGenerator[str]:
+        if url:
+            yield url
+            return
+
+        # uvicorn only speaks HTTP/1.1, so the stub implements HTTP/2 with h2 itself
+        async def handle_connection(
+            reader: asyncio.StreamReader,
+            writer: asyncio.StreamWriter,
+        ) -> None:
+            connection = H2Connection(H2Configuration(client_side=False))
+            connection.initiate_connection()
+            writer.write(connection.data_to_send())
+
+            async def respond(stream_id: int) -> None:
+                await asyncio.sleep(latency / 1000)
+                connection.send_headers(
+                    stream_id,
+                    [(":status", "200"), ("content-type", "application/json")],
+                )
+                connection.send_data(stream_id, b"{}", end_stream=True)
+                writer.write(connection.data_to_send())
+
+            async with asyncio.TaskGroup() as task_group:
+                while data := await reader.read(65536):
+                    for event in connection.receive_data(data):
+                        if isinstance(event, RequestReceived) and event.stream_id:
+                            task_group.create_task(respond(event.stream_id))
+                    writer.write(connection.data_to_send())
+
+            writer.close()
+
+        server = await asyncio.start_server(handle_connection, "127.0.0.1", 0)
+        host, port = server.sockets[0].getsockname()
+        async with server:
+            yield f"http://{host}:{port}/"
+
+    async def _send_requests(
+        self,
+        client: AsyncClient,
+        url: str,
+        request_count: int,
+        concurrency: int,
+    ) -> tuple[int, int, float]:
+        semaphore = asyncio.Semaphore(concurrency)
+        error_count = 0
+        connection_count = 0
+
+        async def trace(event_name: str, info: dict[str, Any]) -> None:
+            nonlocal connection_count
+            if event_name == "connection.connect_tcp.complete":
+                connection_count += 1
+
+        async def send_request() -> None:
+            nonlocal error_count
+            async with semaphore:
+                try:
+                    response = await client.get(url, extensions={"trace": trace})
+                    response.raise_for_status()
+                except HTTPError:
+                    error_count += 1
+
+        start_time = time.perf_counter()
+        await asyncio.gather(*(send_request() for _ in range(request_count)))
+        return error_count, connection_count, time.perf_counter() - start_time
+
+
 @app.command()
-def mb_track_lookup(track_id: str) -> None:
-    """Lookup release year of a Spotify track on MusicBrainz."""
+def mb_track_lookup(track_ids: list[str]) -> None:
+    """Lookup release years of Spotify tracks on MusicBrainz."""
     cli = injector.get(MusicbrainzTrackLookupCli)
-    asyncio.run(cli.run(track_id))
+    asyncio.run(cli.run(track_ids))
 
 
 @app.command()
@@ -251,10 +730,10 @@ def mb_playlist_lookup(
 
 
 @app.command()
-def track_metadata(track_id: str) -> None:
-    """Parse metadata of a Spotify track."""
+def track_metadata(track_ids: list[str]) -> None:
+    """Parse metadata of Spotify tracks."""
     cli = injector.get(TrackMetadataParserCli)
-    asyncio.run(cli.run(track_id))
+    asyncio.run(cli.run(track_ids))
 
 
 @app.command()
@@ -274,6 +753,86 @@ def deduplicate_playlist(
     asyncio.run(cli.run(playlist_id, access_token, dry_run=dry_run))
 
 
+@app.command()
+def benchmark_replenish(
+    playlist_ids: list[str],
+    market: Annotated[str, typer.Option("--market")] = "DE",
+    player_count: Annotated[int, typer.Option("--players")] = 4,
+    runs: Annotated[int, typer.Option("--runs")] = 5,
+) -> None:
+    """Count outbound Spotify requests per replenishment of a game's track cache."""
+    cli = injector.get(ReplenishTrackCacheBenchmarkCli)
+    asyncio.run(cli.run(playlist_ids, market, player_count, runs))
+
+
+@app.command()
+def export_catalog(
+    playlist_ids: list[str],
+    market: Annotated[str | None, typer.Option("--market")] = None,
+    output: Annotated[str, typer.Option("-o")] = "catalog.bin",
+) -> None:
+    """Export playlists with validated release years to a track catalog file."""
+    cli = injector.get(TrackCatalogExportCli)
+    asyncio.run(cli.run(playlist_ids, market, Path(output)))
+
+
+@app.command()
+def benchmark_parser(
+    payload: str,
+    runs: Annotated[int, typer.Option("--runs")] = 5,
+    playlist_id: Annotated[str | None, typer.Option("--record")] = None,
+    market: Annotated[str | None, typer.Option("--market")] = None,
+) -> None:
+    """Measure parsing of a recorded payload of playlist items."""
+    cli = injector.get(SpotifyParserBenchmarkCli)
+    asyncio.run(cli.run(Path(payload), runs, playlist_id, market))
+
+
+@app.command()
+def benchmark_http(
+    url: Annotated[str | None, typer.Option("--url")] = None,
+    request_count: Annotated[int, typer.Option("--requests")] = 1000,
+    concurrency: Annotated[int, typer.Option("--concurrency")] = 200,
+    latency: Annotated[float, typer.Option("--latency")] = 50,
+) -> None:
+    """Compare the throughput of outbound HTTP clients against a local stub server."""
+    cli = injector.get(HttpClientBenchmarkCli)
+    asyncio.run(cli.run(url, request_count, concurrency, latency))
+
+
+@app.command()
+def serve_standins(
+    port: Annotated[int, typer.Option("--port")] = 8001,
+    latency: Annotated[float, typer.Option("--latency")] = 50,
+    error_rate: Annotated[float, typer.Option("--error-rate")] = 0,
+    throttle_rate: Annotated[float, typer.Option("--throttle-rate")] = 0,
+    retry_after: Annotated[int, typer.Option("--retry-after")] = 1,
+) -> None:
+    """
+    Serve local stand-ins for Spotify on the given port and for MusicBrainz on the
+    next one. With the default port, point the backend at them by setting
+    SPOTIFY_API_URL=http://localhost:8001/v1,
+    SPOTIFY_ACCOUNTS_URL=http://localhost:8001 and
+    MUSICBRAINZ_API_URL=http://localhost:8002/ws/2/.
+    """
+    behavior = StandInBehavior(
+        latency=latency,
+        jitter=latency / 2,
+        error_rate=error_rate,
+        throttle_rate=throttle_rate,
+        retry_after=retry_after,
+    )
+    servers = [
+        uvicorn.Server(uvicorn.Config(create_spotify_app(behavior), port=port)),
+        uvicorn.Server(uvicorn.Config(create_musicbrainz_app(behavior), port=port + 1)),
+    ]
+
+    async def serve() -> None:
+        await asyncio.gather(*(server.serve() for server in servers))
+
+    asyncio.run(serve())
+
+
 def main() -> None:
     os.environ.setdefault("ENVIRONMENT", "development")
     app()
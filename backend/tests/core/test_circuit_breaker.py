@@ -0,0 +1,157 @@
+import asyncio
+import time
+
+import pytest
+from httpx import AsyncBaseTransport, AsyncClient, ConnectError, Request, Response
+
+from trackline.core.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerTransport,
+    CircuitOpenError,
+    CircuitState,
+)
+from trackline.core.deadline import DeadlineExceededError
+from trackline.core.metrics import Metrics
+
+
+class StubTransport(AsyncBaseTransport):
+    def __init__(self) -> None:
+        self.status_code = 200
+        self.error: BaseException | None = None
+
+    async def handle_async_request(self, request: Request) -> Response:
+        if self.error:
+            raise self.error
+        return Response(self.status_code)
+
+
+def create_circuit_breaker(reset_timeout: float = 60) -> CircuitBreaker:
+    return CircuitBreaker(
+        "test",
+        Metrics(),
+        failure_threshold=2,
+        reset_timeout=reset_timeout,
+    )
+
+
+def test_opens_after_consecutive_failures() -> None:
+    circuit_breaker = create_circuit_breaker()
+
+    circuit_breaker.acquire()
+    circuit_breaker.on_failure()
+    assert circuit_breaker.state == CircuitState.CLOSED
+
+    circuit_breaker.acquire()
+    circuit_breaker.on_failure()
+    assert circuit_breaker.state == CircuitState.OPEN
+
+    with pytest.raises(CircuitOpenError):
+        circuit_breaker.acquire()
+
+
+def test_success_resets_failure_count() -> None:
+    circuit_breaker = create_circuit_breaker()
+
+    circuit_breaker.on_failure()
+    circuit_breaker.on_success()
+    circuit_breaker.on_failure()
+
+    assert circuit_breaker.state == CircuitState.CLOSED
+
+
+def test_half_open_circuit_lets_single_trial_through() -> None:
+    circuit_breaker = create_circuit_breaker(reset_timeout=0)
+    circuit_breaker.on_failure()
+    circuit_breaker.on_failure()
+    assert circuit_breaker.state == CircuitState.HALF_OPEN
+
+    circuit_breaker.acquire()
+    with pytest.raises(CircuitOpenError):
+        circuit_breaker.acquire()
+
+
+def test_successful_trial_closes_circuit() -> None:
+    circuit_breaker = create_circuit_breaker(reset_timeout=0)
+    circuit_breaker.on_failure()
+    circuit_breaker.on_failure()
+
+    circuit_breaker.acquire()
+    circuit_breaker.on_success()
+
+    assert circuit_breaker.state == CircuitState.CLOSED
+
+
+def test_failed_trial_opens_circuit_again() -> None:
+    circuit_breaker = create_circuit_breaker(reset_timeout=0.05)
+    circuit_breaker.on_failure()
+    circuit_breaker.on_failure()
+    time.sleep(0.05)
+    assert circuit_breaker.state == CircuitState.HALF_OPEN
+
+    circuit_breaker.acquire()
+    circuit_breaker.on_failure()
+
+    assert circuit_breaker.state == CircuitState.OPEN
+
+
+def test_cancelled_trial_allows_another_trial() -> None:
+    circuit_breaker = create_circuit_breaker(reset_timeout=0)
+    circuit_breaker.on_failure()
+    circuit_breaker.on_failure()
+
+    circuit_breaker.acquire()
+    circuit_breaker.on_cancel()
+
+    circuit_breaker.acquire()
+
+
+def test_exports_state() -> None:
+    metrics = Metrics()
+    circuit_breaker = CircuitBreaker(
+        "test", metrics, failure_threshold=1, reset_timeout=60
+    )
+    assert metrics.get("test.circuit_state") == CircuitState.CLOSED
+
+    circuit_breaker.on_failure()
+
+    assert metrics.get("test.circuit_state") == CircuitState.OPEN
+
+
+async def test_transport_counts_server_errors_and_exceptions_as_failures() -> None:
+    circuit_breaker = create_circuit_breaker()
+    transport = StubTransport()
+    client = AsyncClient(transport=CircuitBreakerTransport(transport, circuit_breaker))
+
+    transport.status_code = 503
+    await client.get("http://test")
+    transport.error = ConnectError("Connection refused")
+    with pytest.raises(ConnectError):
+        await client.get("http://test")
+
+    assert circuit_breaker.state == CircuitState.OPEN
+    with pytest.raises(CircuitOpenError):
+        await client.get("http://test")
+
+
+@pytest.mark.parametrize(
+    "error",
+    [asyncio.CancelledError(), DeadlineExceededError()],
+    ids=["cancelled", "deadline"],
+)
+async def test_transport_doesnt_count_abandoned_requests(
+    error: BaseException,
+) -> None:
+    circuit_breaker = create_circuit_breaker(reset_timeout=0)
+    circuit_breaker.on_failure()
+    circuit_breaker.on_failure()
+    transport = StubTransport()
+    client = AsyncClient(transport=CircuitBreakerTransport(transport, circuit_breaker))
+
+    transport.error = error
+    with pytest.raises(type(error)):
+        await client.get("http://test")
+
+    # The trial has been given up without a result, so another one is let through
+    transport.error = None
+    await client.get("http://test")
+    assert circuit_breaker.state == CircuitState.CLOSED
@@ -0,0 +1,69 @@
+import asyncio
+from contextlib import nullcontext
+from unittest.mock import create_autospec
+
+import pytest
+from injector import Injector
+
+from trackline.core.db.client import DatabaseClient
+from trackline.core.db.unit_of_work import UnitOfWork
+from trackline.core.deadline import (
+    DeadlineExceededError,
+    get_remaining_time,
+    is_deadline_exceeded,
+)
+from trackline.core.exceptions import RequestError
+from trackline.core.notifications.notifier import Notifier
+from trackline.core.settings import Settings
+from trackline.core.use_cases import AnonymousUseCase, UseCaseExecutor
+
+
+class SlowUseCase(AnonymousUseCase[float | None]):
+    duration: float
+
+
+@SlowUseCase.register_handler
+class SlowUseCaseHandler:
+    async def execute(self, use_case: SlowUseCase) -> float | None:
+        remaining_time = get_remaining_time()
+        await asyncio.sleep(use_case.duration)
+        if is_deadline_exceeded():
+            raise DeadlineExceededError
+
+        return remaining_time
+
+
+def create_executor() -> UseCaseExecutor:
+    db_client = create_autospec(DatabaseClient, instance=True)
+    db_client.start_session.return_value = nullcontext()
+    return UseCaseExecutor(
+        Injector(),
+        db_client,
+        Settings(
+            spotify_client_id="client_id",
+            spotify_client_secret="client_secret",
+            spotify_redirect_url="http://localhost",
+            use_case_deadlines={"slow_use_case": 100},
+        ),
+        create_autospec(UnitOfWork, instance=True),
+        create_autospec(Notifier, instance=True),
+    )
+
+
+async def test_executes_use_case_with_deadline() -> None:
+    executor = create_executor()
+
+    remaining_time = await executor.execute(SlowUseCase(duration=0))
+
+    assert remaining_time
+    assert 0 < remaining_time <= 0.1
+
+
+async def test_exceeded_deadline_is_reported_as_unavailable() -> None:
+    executor = create_executor()
+
+    with pytest.raises(RequestError) as exc_info:
+        await executor.execute(SlowUseCase(duration=0.2))
+
+    assert exc_info.value.code == "DEADLINE_EXCEEDED"
+    assert exc_info.value.status_code == 503
@@ -0,0 +1,31 @@
+from collections import Counter
+from itertools import islice
+
+from trackline.core.utils import lazy_shuffle
+
+
+def test_yields_permutation() -> None:
+    assert sorted(lazy_shuffle(100)) == list(range(100))
+
+
+def test_yields_nothing_for_empty_range() -> None:
+    assert list(lazy_shuffle(0)) == []
+
+
+def test_is_deterministic_for_seed() -> None:
+    assert list(lazy_shuffle(100, seed=42)) == list(lazy_shuffle(100, seed=42))
+    assert list(lazy_shuffle(100, seed=42)) != list(lazy_shuffle(100, seed=43))
+
+
+def test_partial_consumption_yields_distinct_items() -> None:
+    items = list(islice(lazy_shuffle(10**9, seed=1), 1000))
+
+    assert len(set(items)) == len(items)
+    assert all(0 <= item < 10**9 for item in items)
+
+
+def test_first_item_is_uniformly_distributed() -> None:
+    counts = Counter(next(lazy_shuffle(4, seed=seed)) for seed in range(4000))
+
+    assert set(counts) == {0, 1, 2, 3}
+    assert all(800 < count < 1200 for count in counts.values())
@@ -0,0 +1,66 @@
+import asyncio
+import time
+
+import pytest
+from httpx import Response
+
+from trackline.core.deadline import DeadlineExceededError, deadline
+from trackline.core.settings import Settings
+from trackline.games.services.music_brainz_rate_limiter import MusicBrainzRateLimiter
+
+INTERVAL = 0.05
+
+
+def create_rate_limiter() -> MusicBrainzRateLimiter:
+    return MusicBrainzRateLimiter(
+        Settings(
+            spotify_client_id="client_id",
+            spotify_client_secret="client_secret",
+            spotify_redirect_url="http://localhost",
+            musicbrainz_request_interval=int(INTERVAL * 1000),
+        )
+    )
+
+
+async def test_spaces_out_requests() -> None:
+    rate_limiter = create_rate_limiter()
+    start_time = time.monotonic()
+
+    await asyncio.gather(*(rate_limiter.acquire() for _ in range(3)))
+
+    assert time.monotonic() - start_time >= 2 * INTERVAL
+
+
+async def test_honors_retry_after() -> None:
+    rate_limiter = create_rate_limiter()
+    await rate_limiter.acquire()
+    start_time = time.monotonic()
+
+    rate_limiter.on_response(Response(503, headers={"Retry-After": "0.2"}))
+    await rate_limiter.acquire()
+
+    assert time.monotonic() - start_time >= 0.2
+
+
+async def test_fails_fast_if_request_cant_be_sent_before_deadline() -> None:
+    rate_limiter = create_rate_limiter()
+    rate_limiter.on_response(Response(503, headers={"Retry-After": "10"}))
+    start_time = time.monotonic()
+
+    with deadline(1), pytest.raises(DeadlineExceededError):
+        await rate_limiter.acquire()
+
+    assert time.monotonic() - start_time < INTERVAL
+
+
+async def test_accounts_for_queued_requests_in_deadline() -> None:
+    rate_limiter = create_rate_limiter()
+    await rate_limiter.acquire()
+    queued_requests = [asyncio.create_task(rate_limiter.acquire()) for _ in range(3)]
+    await asyncio.sleep(0)
+
+    # The request would have to wait for the three queued requests first
+    with deadline(2 * INTERVAL), pytest.raises(DeadlineExceededError):
+        await rate_limiter.acquire()
+
+    await asyncio.gather(*queued_requests)
@@ -0,0 +1,101 @@
+from datetime import timedelta
+
+from beanie import PydanticObjectId
+
+from trackline.core.settings import Settings
+from trackline.core.utils.datetime import utcnow
+from trackline.games.models import (
+    ArtistsMatchMode,
+    Game,
+    GameSettings,
+    Player,
+    Playlist,
+    TitleMatchMode,
+    Track,
+    Turn,
+)
+from trackline.games.services.prefetch_planner import PrefetchPlanner
+
+
+def create_settings() -> Settings:
+    return Settings(
+        spotify_client_id="client_id",
+        spotify_client_secret="client_secret",
+        spotify_redirect_url="http://localhost",
+        track_cache_max_depth=10,
+        track_cache_prefetch_window=600000,
+    )
+
+
+def create_game(player_count: int, turn_count: int) -> Game:
+    players = [Player(user_id=PydanticObjectId()) for _ in range(player_count)]
+    now = utcnow()
+    # Games are never persisted here, so they bypass the initialization of beanie
+    return Game.model_construct(
+        id=PydanticObjectId(),
+        join_code="TEST",
+        settings=GameSettings(
+            spotify_market="DE",
+            playlists=[Playlist(spotify_id="playlist", track_count=100)],
+            initial_tokens=2,
+            max_tokens=5,
+            timeline_length=10,
+            guess_timeout=30000,
+            artists_match_mode=ArtistsMatchMode.ONE,
+            title_match_mode=TitleMatchMode.MAIN,
+            credits_similarity_threshold=0.9,
+            credits_filter_stop_words=True,
+            credits_convert_numbers=True,
+            enable_catchup=True,
+        ),
+        players=players,
+        turns=[
+            Turn(
+                creation_time=now - timedelta(seconds=i * 30),
+                round_number=1,
+                active_user_id=players[i % player_count].user_id,
+                track=Track(
+                    spotify_id=f"track{i}",
+                    title="Title",
+                    artists=["Artist"],
+                    release_year=2000,
+                ),
+            )
+            for i in range(turn_count)
+        ],
+    )
+
+
+def test_target_size_covers_initial_tracks() -> None:
+    planner = PrefetchPlanner(create_settings())
+    game = create_game(player_count=4, turn_count=0)
+
+    assert planner.get_target_size(game) == 5
+
+
+def test_target_size_covers_tracks_bought_during_scoring() -> None:
+    planner = PrefetchPlanner(create_settings())
+    game = create_game(player_count=4, turn_count=5)
+    assert game.id
+    # Fetches are fast, so the consumption rate alone asks for a single track
+    planner.record_fetch(game.id, track_count=10, duration=0.1)
+
+    # Each player may buy a track while the next turn is being created
+    assert planner.get_target_size(game) == 5
+
+
+def test_target_size_is_limited_to_max_depth() -> None:
+    planner = PrefetchPlanner(create_settings())
+    game = create_game(player_count=2, turn_count=5)
+    assert game.id
+    # Fetches are so slow that the consumption rate asks for many more tracks
+    planner.record_fetch(game.id, track_count=1, duration=1000)
+
+    assert planner.get_target_size(game) == 10
+
+
+def test_target_size_covers_all_players_beyond_max_depth() -> None:
+    planner = PrefetchPlanner(create_settings())
+    game = create_game(player_count=12, turn_count=5)
+
+    assert planner.get_target_size(game) == 13
@@ -0,0 +1,84 @@
+from pathlib import Path
+
+import pytest
+
+from trackline.games.services.track_catalog import (
+    CatalogPlaylist,
+    FileTrackCatalog,
+    InvalidCatalogError,
+)
+from trackline.spotify.models import SpotifyTrack
+
+
+def create_track(index: int) -> SpotifyTrack:
+    return SpotifyTrack(
+        id=f"track{index}",
+        artists=[f"Artist {index}", "Ünïcödé"],
+        title=f"Title {index}",
+        release_year=1950 + index,
+        is_playable=True,
+        image_url=f"https://images/{index}" if index % 2 else None,
+    )
+
+
+def test_round_trip(tmp_path: Path) -> None:
+    path = tmp_path / "catalog.bin"
+    tracks = [create_track(i) for i in range(10)]
+    FileTrackCatalog.write(
+        path,
+        {
+            ("playlist1", "DE"): CatalogPlaylist(snapshot_id="snap1", tracks=tracks),
+            ("playlist2", None): CatalogPlaylist(snapshot_id="snap2", tracks=[]),
+        },
+    )
+
+    catalog = FileTrackCatalog(path)
+
+    playlist = catalog.get_playlist("playlist1", market="DE")
+    assert playlist
+    assert playlist.snapshot_id == "snap1"
+    assert list(playlist.tracks) == tracks
+    playlist = catalog.get_playlist("playlist2")
+    assert playlist
+    assert playlist.snapshot_id == "snap2"
+    assert len(playlist.tracks) == 0
+
+
+def test_serves_playlists_only_for_their_market(tmp_path: Path) -> None:
+    path = tmp_path / "catalog.bin"
+    FileTrackCatalog.write(
+        path,
+        {
+            ("playlist1", "DE"): CatalogPlaylist("snap1", [create_track(0)]),
+            ("playlist2", None): CatalogPlaylist("snap2", [create_track(1)]),
+        },
+    )
+
+    catalog = FileTrackCatalog(path)
+
+    assert catalog.get_playlist("playlist1") is None
+    assert catalog.get_playlist("playlist1", market="US") is None
+    assert catalog.get_playlist("playlist2", market="DE") is None
+    assert catalog.get_playlist("unknown", market="DE") is None
+
+
+def test_track_list_supports_indexing_and_slicing(tmp_path: Path) -> None:
+    path = tmp_path / "catalog.bin"
+    tracks = [create_track(i) for i in range(5)]
+    FileTrackCatalog.write(path, {("playlist", None): CatalogPlaylist("snap", tracks)})
+
+    playlist = FileTrackCatalog(path).get_playlist("playlist")
+    assert playlist
+
+    assert playlist.tracks[-1] == tracks[-1]
+    assert playlist.tracks[1:4] == tracks[1:4]
+    with pytest.raises(IndexError):
+        playlist.tracks[5]
+
+
+def test_rejects_invalid_file(tmp_path: Path) -> None:
+    path = tmp_path / "catalog.bin"
+    path.write_bytes(b"not a catalog")
+
+    with pytest.raises(InvalidCatalogError):
+        FileTrackCatalog(path)
@@ -0,0 +1,166 @@
+from unittest.mock import MagicMock, call, create_autospec
+
+import pytest
+
+from trackline.core.deadline import DeadlineExceededError, deadline
+from trackline.core.settings import Settings
+from trackline.games.models import Playlist
+from trackline.games.services.track_sampler import (
+    PlaylistsExhaustedError,
+    PlaylistSource,
+    PlaylistSourceProvider,
+    TrackSampler,
+)
+from trackline.spotify.models import SpotifyTrack
+from trackline.spotify.services.spotify_client import SpotifyClient
+
+PAGE_SIZE = 50
+TRACK_COUNT = 120
+PLAYLISTS = [Playlist(spotify_id="playlist", track_count=TRACK_COUNT)]
+
+
+def create_settings() -> Settings:
+    return Settings(
+        spotify_client_id="client_id",
+        spotify_client_secret="client_secret",
+        spotify_redirect_url="http://localhost",
+        track_fetcher_spotify_concurrency=4,
+    )
+
+
+def create_tracks() -> list[SpotifyTrack | None]:
+    # Every 7th track is not playable, every 10th has been removed from Spotify
+    return [
+        None
+        if i % 10 == 0
+        else SpotifyTrack(
+            id=f"track{i}",
+            artists=["Artist"],
+            title=f"Title {i}",
+            release_year=2000,
+            is_playable=i % 7 != 0,
+        )
+        for i in range(TRACK_COUNT)
+    ]
+
+
+def get_unusable_indices() -> set[int]:
+    return {i for i in range(TRACK_COUNT) if i % 10 == 0 or i % 7 == 0}
+
+
+def create_spotify_client(tracks: list[SpotifyTrack | None]) -> MagicMock:
+    async def get_playlist_page(
+        playlist_id: str,
+        offset: int = 0,
+        market: str | None = None,
+    ) -> list[SpotifyTrack | None]:
+        return tracks[offset : offset + PAGE_SIZE]
+
+    spotify_client = create_autospec(SpotifyClient, instance=True)
+    spotify_client.MAX_LIMIT = PAGE_SIZE
+    spotify_client.get_playlist_page.side_effect = get_playlist_page
+    return spotify_client
+
+
+def create_source_provider(source: PlaylistSource) -> MagicMock:
+    source_provider = create_autospec(PlaylistSourceProvider, instance=True)
+    source_provider.get_sources.return_value = [source]
+    return source_provider
+
+
+async def test_fetches_each_page_once() -> None:
+    spotify_client = create_spotify_client(create_tracks())
+    source = PlaylistSource("playlist", "snapshot", TRACK_COUNT)
+    sampler = TrackSampler(
+        create_settings(), spotify_client, create_source_provider(source)
+    )
+    usable_count = TRACK_COUNT - len(get_unusable_indices())
+
+    sampled_tracks = await sampler.sample(PLAYLISTS, usable_count, market="DE")
+
+    assert len({t.track.id for t in sampled_tracks}) == usable_count
+    assert not any(t.is_validated for t in sampled_tracks)
+    page_requests = spotify_client.get_playlist_page.await_args_list
+    assert len(page_requests) == 3
+    for offset in (0, 50, 100):
+        assert call("playlist", offset=offset, market="DE") in page_requests
+
+
+async def test_records_unusable_indices() -> None:
+    spotify_client = create_spotify_client(create_tracks())
+    source = PlaylistSource("playlist", "snapshot", TRACK_COUNT)
+    source_provider = create_source_provider(source)
+    sampler = TrackSampler(create_settings(), spotify_client, source_provider)
+
+    with pytest.raises(PlaylistsExhaustedError):
+        await sampler.sample(PLAYLISTS, TRACK_COUNT, market="DE")
+
+    assert source.new_unusable_indices == get_unusable_indices()
+    source_provider.save_unusable_indices.assert_awaited_once_with(
+        [source], market="DE"
+    )
+
+
+async def test_skips_known_unusable_indices() -> None:
+    spotify_client = create_spotify_client(create_tracks())
+    # All tracks of the first page are known to be unusable
+    source = PlaylistSource(
+        "playlist", "snapshot", TRACK_COUNT, unusable_indices=set(range(PAGE_SIZE))
+    )
+    sampler = TrackSampler(
+        create_settings(), spotify_client, create_source_provider(source)
+    )
+
+    with pytest.raises(PlaylistsExhaustedError):
+        await sampler.sample(PLAYLISTS, TRACK_COUNT)
+
+    offsets = {
+        c.kwargs["offset"] for c in spotify_client.get_playlist_page.await_args_list
+    }
+    assert offsets == {50, 100}
+
+
+async def test_samples_local_tracks_without_requests() -> None:
+    tracks = [t for t in create_tracks() if t]
+    spotify_client = create_spotify_client([])
+    source = PlaylistSource(
+        "playlist", "snapshot", len(tracks), tracks=tracks, is_validated=True
+    )
+    sampler = TrackSampler(
+        create_settings(), spotify_client, create_source_provider(source)
+    )
+
+    sampled_tracks = await sampler.sample(PLAYLISTS, 10)
+
+    assert len(sampled_tracks) == 10
+    assert all(t.is_validated and t.track.is_playable for t in sampled_tracks)
+    spotify_client.get_playlist_page.assert_not_awaited()
+    # Local track lists are fixed, so their unusable tracks aren't recorded
+    assert not source.new_unusable_indices
+
+
+async def test_excludes_tracks() -> None:
+    tracks = [t for t in create_tracks() if t and t.is_playable]
+    source = PlaylistSource("playlist", "snapshot", len(tracks), tracks=tracks)
+    sampler = TrackSampler(
+        create_settings(), create_spotify_client([]), create_source_provider(source)
+    )
+    exclude = {t.id for t in tracks[:-5]}
+
+    sampled_tracks = await sampler.sample(PLAYLISTS, 5, exclude=exclude)
+
+    assert {t.track.id for t in sampled_tracks} == {t.id for t in tracks[-5:]}
+
+
+async def test_gives_up_once_deadline_is_exceeded() -> None:
+    spotify_client = create_spotify_client(create_tracks())
+    source = PlaylistSource("playlist", "snapshot", TRACK_COUNT)
+    source_provider = create_source_provider(source)
+    sampler = TrackSampler(create_settings(), spotify_client, source_provider)
+
+    with deadline(0), pytest.raises(DeadlineExceededError):
+        await sampler.sample(PLAYLISTS, 50)
+
+    # Only the pages of the first round of candidates have been fetched
+    assert spotify_client.get_playlist_page.await_count <= 4
+    source_provider.save_unusable_indices.assert_awaited_once()
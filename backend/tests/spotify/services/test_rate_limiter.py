@@ -0,0 +1,83 @@
+import time
+
+import pytest
+from httpx import Response
+
+from trackline.core.deadline import DeadlineExceededError, deadline
+from trackline.core.metrics import Metrics
+from trackline.core.settings import Settings
+from trackline.spotify.services.rate_limiter import SpotifyRateLimiter
+
+
+def create_rate_limiter(metrics: Metrics | None = None) -> SpotifyRateLimiter:
+    return SpotifyRateLimiter(
+        Settings(
+            spotify_client_id="client_id",
+            spotify_client_secret="client_secret",
+            spotify_redirect_url="http://localhost",
+            spotify_rate_limit_min=1,
+            spotify_rate_limit_max=20,
+            spotify_rate_limit_burst=3,
+            spotify_rate_limit_max_retry_after=300,
+        ),
+        metrics or Metrics(),
+    )
+
+
+async def test_allows_burst() -> None:
+    rate_limiter = create_rate_limiter()
+    start_time = time.monotonic()
+
+    for _ in range(3):
+        await rate_limiter.acquire()
+
+    assert time.monotonic() - start_time < 0.05
+
+
+async def test_limits_rate_after_burst() -> None:
+    rate_limiter = create_rate_limiter()
+    for _ in range(3):
+        await rate_limiter.acquire()
+    start_time = time.monotonic()
+
+    await rate_limiter.acquire()
+    await rate_limiter.acquire()
+
+    # At 20 requests per second, every further token takes 50 ms
+    assert time.monotonic() - start_time >= 0.09
+
+
+async def test_adapts_rate_to_responses() -> None:
+    metrics = Metrics()
+    rate_limiter = create_rate_limiter(metrics)
+
+    rate_limiter.on_response(Response(429, headers={"Retry-After": "0"}))
+    assert rate_limiter.rate == 10
+    rate_limiter.on_response(Response(200))
+    assert rate_limiter.rate == pytest.approx(10.1)
+
+    assert metrics.get("spotify.rate_limit") == rate_limiter.rate
+    assert metrics.get("spotify.throttled") == 1
+
+
+async def test_pauses_requests_for_capped_retry_after() -> None:
+    rate_limiter = create_rate_limiter()
+    rate_limiter.on_response(Response(429, headers={"Retry-After": "3600"}))
+    start_time = time.monotonic()
+
+    await rate_limiter.acquire()
+
+    # Retry-After is capped to 300 ms, after which the empty bucket is refilled
+    duration = time.monotonic() - start_time
+    assert 0.3 <= duration < 1
+
+
+async def test_fails_fast_if_token_isnt_available_before_deadline() -> None:
+    rate_limiter = create_rate_limiter()
+    rate_limiter.on_response(Response(429, headers={"Retry-After": "1"}))
+    start_time = time.monotonic()
+
+    with deadline(0.1), pytest.raises(DeadlineExceededError):
+        await rate_limiter.acquire()
+
+    assert time.monotonic() - start_time < 0.05
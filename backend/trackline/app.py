@@ -13,6 +13,7 @@ from trackline.core.background_tasks import BackgroundTaskManager
 from trackline.core.db.client import DatabaseClient
 from trackline.core.deps import websocket_logger
 from trackline.core.logging import initialize_sentry
+from trackline.core.metrics import MetricsReporter
 from trackline.core.middleware import (
     ExceptionHandlingMiddleware,
     LoggingMiddleware,
@@ -24,6 +25,7 @@ from trackline.core.settings import Settings
 from trackline.di import injector
 from trackline.games.router import router as games_router
 from trackline.spotify.router import router as spotify_router
+from trackline.spotify.services.http_client import SpotifyHttpClient
 from trackline.spotify.services.spotify_client import SpotifyClient
 from trackline.users.router import router as users_router
 
@@ -41,13 +43,14 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None]:
 
     log.info("Application startup complete.")
 
-    async with injector.get(BackgroundTaskManager):
+    async with injector.get(BackgroundTaskManager), injector.get(MetricsReporter):
         yield
 
     log.info("Waiting for application shutdown.")
 
     spotify_client = injector.get(SpotifyClient)
     await spotify_client.close()
+    await injector.get(SpotifyHttpClient).aclose()
 
     log.info("Application shutdown complete.")
 
@@ -0,0 +1,131 @@
+import asyncio
+import time
+from enum import IntEnum
+
+from fastapi import status
+from httpx import AsyncBaseTransport, Request, Response
+
+from trackline.core.deadline import DeadlineExceededError
+from trackline.core.metrics import Metrics
+
+
+class CircuitState(IntEnum):
+    # Values are exported as gauge, so that higher values mean less availability
+    CLOSED = 0
+    HALF_OPEN = 1
+    OPEN = 2
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, name: str) -> None:
+        super().__init__(f"The circuit {name} is open")
+        self.name = name
+
+
+class CircuitBreaker:
+    """
+    Stops calls to a failing service for a while, so that callers fail fast
+    instead of piling up on timeouts and retries.
+
+    The circuit opens after a number of consecutive failures. Once the reset timeout
+    has passed, it is half-open and lets a single trial call through, which either
+    closes the circuit again or keeps it open for another period.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        metrics: Metrics,
+        failure_threshold: int,
+        reset_timeout: float,
+    ) -> None:
+        self._name = name
+        self._metrics = metrics
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+
+        self._failure_count = 0
+        self._open_time: float | None = None
+        self._is_trial_pending = False
+
+        self._metrics.set_gauge(f"{self._name}.circuit_state", CircuitState.CLOSED)
+
+    @property
+    def state(self) -> CircuitState:
+        if self._open_time is None:
+            return CircuitState.CLOSED
+        if time.monotonic() - self._open_time < self._reset_timeout:
+            return CircuitState.OPEN
+        return CircuitState.HALF_OPEN
+
+    def acquire(self) -> None:
+        state = self.state
+        if state == CircuitState.OPEN or (
+            state == CircuitState.HALF_OPEN and self._is_trial_pending
+        ):
+            self._metrics.increment(f"{self._name}.circuit_rejected")
+            raise CircuitOpenError(self._name)
+
+        if state == CircuitState.HALF_OPEN:
+            self._is_trial_pending = True
+        self._export_state()
+
+    def on_success(self) -> None:
+        self._failure_count = 0
+        self._open_time = None
+        self._is_trial_pending = False
+        self._export_state()
+
+    def on_failure(self) -> None:
+        self._failure_count += 1
+        # A failed trial opens the circuit right away
+        if self._is_trial_pending or self._failure_count >= self._failure_threshold:
+            self._open_time = time.monotonic()
+        self._is_trial_pending = False
+        self._export_state()
+
+    def on_cancel(self) -> None:
+        # Cancelled calls neither close nor open the circuit, but allow another trial
+        self._is_trial_pending = False
+
+    def _export_state(self) -> None:
+        self._metrics.set_gauge(f"{self._name}.circuit_state", self.state)
+
+
+class CircuitBreakerTransport(AsyncBaseTransport):
+    """
+    Transport that counts exceptions and server errors as failures. It is meant to
+    wrap the retrying transport, so that an open circuit skips all retries.
+    """
+
+    def __init__(
+        self,
+        transport: AsyncBaseTransport,
+        circuit_breaker: CircuitBreaker,
+    ) -> None:
+        self._transport = transport
+        self._circuit_breaker = circuit_breaker
+
+    async def handle_async_request(self, request: Request) -> Response:
+        self._circuit_breaker.acquire()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except (asyncio.CancelledError, DeadlineExceededError):
+            # Requests given up before a response tell nothing about the service
+            self._circuit_breaker.on_cancel()
+            raise
+        except Exception:
+            # Any other error counts as failure, so that a failed trial never leaves
+            # the circuit half-open with a pending trial forever
+            self._circuit_breaker.on_failure()
+            raise
+
+        if response.status_code >= status.HTTP_500_INTERNAL_SERVER_ERROR:
+            self._circuit_breaker.on_failure()
+        else:
+            self._circuit_breaker.on_success()
+
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
@@ -10,7 +10,14 @@ from pymongo.asynchronous.client_session import AsyncClientSession
 
 from trackline.auth.models import Session
 from trackline.core.settings import Settings
-from trackline.games.models import Game, TrackCorrection
+from trackline.games.models import (
+    Game,
+    PlaylistSnapshot,
+    ReleaseYearCacheEntry,
+    TrackCorrection,
+    UnusablePlaylistEntries,
+)
+from trackline.spotify.models import CachedSpotifyTrack
 from trackline.users.models import User
 
 session_ctx: ContextVar[AsyncClientSession | None] = ContextVar(
@@ -35,7 +42,16 @@ class DatabaseClient:
     async def initialize(self) -> None:
         await init_beanie(
             database=self._database,
-            document_models=[Session, Game, TrackCorrection, User],
+            document_models=[
+                CachedSpotifyTrack,
+                Session,
+                Game,
+                PlaylistSnapshot,
+                ReleaseYearCacheEntry,
+                TrackCorrection,
+                UnusablePlaylistEntries,
+                User,
+            ],
             skip_indexes=True,
         )
 
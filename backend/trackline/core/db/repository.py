@@ -1,7 +1,7 @@
-from collections.abc import Mapping
+from collections.abc import Iterable, Mapping
 from typing import Any, overload
 
-from beanie import SortDirection
+from beanie import BulkWriter, SortDirection
 from injector import inject
 from pymongo.asynchronous.client_session import AsyncClientSession
 from pymongo.results import DeleteResult
@@ -58,9 +58,65 @@ class Repository:
             ).to_list()
         )
 
+    async def exists[T: BaseDocument](
+        self,
+        document_type: type[T],
+        query: Query,
+    ) -> bool:
+        return bool(
+            await document_type.find_many(
+                query,
+                limit=1,
+                session=self._session,
+            ).count()
+        )
+
     async def create[T: BaseDocument](self, document: T) -> T:
         return self._track(await document.create(session=self._session))
 
+    async def update_one[T: BaseDocument](
+        self,
+        document_type: type[T],
+        query: Query,
+        update: Mapping[str, Any],
+        *,
+        upsert: bool = False,
+    ) -> None:
+        await document_type.find_one(query).update(
+            update,
+            upsert=upsert,
+            session=self._session,
+        )
+
+    async def bulk_upsert[T: BaseDocument](
+        self,
+        document_type: type[T],
+        updates: Iterable[tuple[Query, Mapping[str, Any]]],
+    ) -> None:
+        """
+        Upsert documents in a single unordered bulk write. The write is not part of
+        the current transaction, as it is meant for entries of caches shared by all
+        requests, which must neither conflict nor be rolled back with a use case.
+        """
+        async with BulkWriter(ordered=False) as bulk_writer:
+            for query, update in updates:
+                await document_type.find_one(query).update(
+                    update,
+                    upsert=True,
+                    bulk_writer=bulk_writer,
+                )
+
+    async def bulk_delete[T: BaseDocument](
+        self,
+        document_type: type[T],
+        query: Query,
+    ) -> None:
+        """
+        Delete documents outside of the current transaction, e.g. obsolete entries
+        of caches shared by all requests, like the ones written by bulk_upsert.
+        """
+        await document_type.find_many(query).delete()
+
     async def delete(self, document: BaseDocument) -> DeleteResult | None:
         result = await document.delete(session=self._session)
         self._unit_of_work.remove(document)
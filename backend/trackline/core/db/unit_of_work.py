@@ -1,3 +1,5 @@
+from collections.abc import Callable
+
 from beanie.exceptions import RevisionIdWasChanged
 from injector import inject
 from pymongo.asynchronous.client_session import AsyncClientSession
@@ -28,6 +30,7 @@ class UnitOfWork:
         self._settings = settings
 
         self._documents: dict[Key, BaseDocument] = {}
+        self._commit_callbacks: list[Callable[[], None]] = []
 
     def add(self, document: BaseDocument) -> None:
         self._documents[self._get_key(document)] = document
@@ -38,6 +41,21 @@ class UnitOfWork:
     def clear(self) -> None:
         self._documents.clear()
 
+    def on_commit(self, callback: Callable[[], None]) -> None:
+        """
+        Run the callback once the transaction has been committed. Callbacks of
+        transactions that are aborted or retried are discarded.
+        """
+        self._commit_callbacks.append(callback)
+
+    def run_commit_callbacks(self) -> None:
+        callbacks, self._commit_callbacks = self._commit_callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def discard_commit_callbacks(self) -> None:
+        self._commit_callbacks.clear()
+
     async def save_changes(self) -> None:
         session = self._db_client.session
         if not session:
@@ -0,0 +1,57 @@
+import time
+from collections.abc import Generator
+from contextlib import contextmanager
+from contextvars import Context, ContextVar, copy_context
+
+deadline_ctx: ContextVar[float | None] = ContextVar("deadline", default=None)
+
+
+class DeadlineExceededError(Exception):
+    def __init__(self) -> None:
+        super().__init__("The deadline has been exceeded")
+
+
+@contextmanager
+def deadline(budget: float | None) -> Generator[None]:
+    """
+    Limit the time available to the wrapped code to `budget` seconds.
+
+    The deadline is only advisory: long-running operations are expected to check
+    the remaining time and degrade gracefully. An earlier deadline of an enclosing
+    context is never extended.
+    """
+    if budget is None:
+        yield
+        return
+
+    expiration_time = time.monotonic() + budget
+    if (outer_expiration_time := deadline_ctx.get()) is not None:
+        expiration_time = min(expiration_time, outer_expiration_time)
+
+    token = deadline_ctx.set(expiration_time)
+    try:
+        yield
+    finally:
+        deadline_ctx.reset(token)
+
+
+def get_remaining_time() -> float | None:
+    expiration_time = deadline_ctx.get()
+    if expiration_time is None:
+        return None
+
+    return max(expiration_time - time.monotonic(), 0)
+
+
+def is_deadline_exceeded() -> bool:
+    return get_remaining_time() == 0
+
+
+def copy_context_without_deadline() -> Context:
+    """
+    Copy the current context for a task that must not be limited by its deadline,
+    e.g. because its result is shared by callers with different deadlines.
+    """
+    context = copy_context()
+    context.run(deadline_ctx.set, None)
+    return context
@@ -4,6 +4,7 @@ from injector import Binder, Module, provider, singleton
 from trackline.core.background_tasks import BackgroundTaskManager
 from trackline.core.db.client import DatabaseClient
 from trackline.core.db.unit_of_work import UnitOfWork
+from trackline.core.metrics import Metrics, MetricsReporter
 from trackline.core.notifications.channel_manager import NotificationChannelManager
 from trackline.core.notifications.notifier import Notifier
 from trackline.core.settings import Settings, get_settings
@@ -16,6 +17,9 @@ class CoreModule(Module):
 
         binder.bind(BackgroundTaskManager, scope=singleton)
 
+        binder.bind(Metrics, scope=singleton)
+        binder.bind(MetricsReporter, scope=singleton)
+
         binder.bind(NotificationChannelManager, scope=singleton)
         binder.bind(Notifier, scope=request_scope)
 
@@ -0,0 +1,77 @@
+import asyncio
+import logging
+from collections import Counter
+from collections.abc import Mapping
+from types import TracebackType
+from typing import Self
+
+from injector import inject
+
+from trackline.core.settings import Settings
+
+log = logging.getLogger(__name__)
+
+
+class Metrics:
+    def __init__(self) -> None:
+        self._counters: Counter[str] = Counter()
+        self._gauges: dict[str, float] = {}
+
+    def increment(self, name: str, value: int = 1) -> None:
+        self._counters[name] += value
+
+    def set_gauge(self, name: str, value: float) -> None:
+        self._gauges[name] = value
+
+    def get(self, name: str) -> float:
+        if name in self._gauges:
+            return self._gauges[name]
+
+        return self._counters[name]
+
+    def snapshot(self) -> Mapping[str, float]:
+        return {**self._counters, **self._gauges}
+
+
+class MetricsReporter:
+    """
+    Periodically logs a snapshot of the metrics, from which they are collected along
+    with the other logs of the process.
+    """
+
+    @inject
+    def __init__(self, settings: Settings, metrics: Metrics) -> None:
+        self._settings = settings
+        self._metrics = metrics
+
+        self._reporter_task: asyncio.Task[None] | None = None
+
+    async def __aenter__(self) -> Self:
+        self._reporter_task = asyncio.create_task(self._run_reporter())
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> bool | None:
+        if reporter_task := self._reporter_task:
+            reporter_task.cancel()
+            await asyncio.wait((reporter_task,))
+
+        self.report()
+
+    def report(self) -> None:
+        if snapshot := self._metrics.snapshot():
+            log.info(
+                "Metrics: %s",
+                ", ".join(
+                    f"{name}={value:g}" for name, value in sorted(snapshot.items())
+                ),
+            )
+
+    async def _run_reporter(self) -> None:
+        while True:
+            await asyncio.sleep(self._settings.metrics_report_interval / 1000)
+            self.report()
@@ -1,5 +1,6 @@
 import os
 from enum import Enum
+from pathlib import Path
 
 from pydantic import PositiveInt
 from pydantic_settings import BaseSettings
@@ -16,6 +17,7 @@ class Settings(BaseSettings):
     app_contact_email: str | None = None
 
     log_level: LogLevel = LogLevel.INFO
+    metrics_report_interval: PositiveInt = 60000
 
     host: str = "localhost"
     port: PositiveInt = 8000
@@ -27,17 +29,67 @@ class Settings(BaseSettings):
     db_txn_retries_min_interval: PositiveInt = 100
     db_txn_retries_jitter: PositiveInt = 50
 
+    # Connection pool of outbound HTTP clients
+    http2_enabled: bool = True
+    http_max_connections: PositiveInt = 100
+    http_max_keepalive_connections: PositiveInt = 20
+    http_keepalive_expiry: PositiveInt = 5000
+    http_timeout: PositiveInt = 5000
+    http_pool_timeout: PositiveInt = 5000
+
+    # Time budgets of use cases that acquire tracks while a player is waiting
+    use_case_deadlines: dict[str, PositiveInt] = {
+        "create_turn": 5000,
+        "exchange_track": 5000,
+        "start_game": 10000,
+    }
+
+    musicbrainz_api_url: str = "https://musicbrainz.org/ws/2/"
+    musicbrainz_request_interval: PositiveInt = 1000
     musicbrainz_retries_max_attempts: PositiveInt = 3
     musicbrainz_retries_min_interval: PositiveInt = 500
+    musicbrainz_min_remaining_time: PositiveInt = 1000
+    musicbrainz_circuit_failure_threshold: PositiveInt = 5
+    musicbrainz_circuit_reset_timeout: PositiveInt = 30000
 
     spotify_client_id: str
     spotify_client_secret: str
     spotify_redirect_url: str
+    spotify_api_url: str = "https://api.spotify.com/v1"
+    spotify_accounts_url: str = "https://accounts.spotify.com"
     spotify_retries_max_attempts: PositiveInt = 3
     spotify_retries_min_interval: PositiveInt = 100
-    spotify_throttle_time: PositiveInt = 200
+    spotify_token_renewal_margin: PositiveInt = 300000
+    spotify_rate_limit_min: PositiveInt = 1
+    spotify_rate_limit_max: PositiveInt = 10
+    spotify_rate_limit_burst: PositiveInt = 5
+    spotify_rate_limit_max_retry_after: PositiveInt = 60000
+    spotify_min_request_timeout: PositiveInt = 1000
+    spotify_circuit_failure_threshold: PositiveInt = 5
+    spotify_circuit_reset_timeout: PositiveInt = 10000
+    spotify_track_cache_max_size: PositiveInt = 10000
+    spotify_track_cache_ttl: PositiveInt = 3600000
 
     track_cache_max_size: PositiveInt = 100
+    track_cache_max_depth: PositiveInt = 10
+    track_cache_prefetch_window: PositiveInt = 600000
+    track_pool_enabled: bool = True
+    track_pool_max_size: PositiveInt = 5000
+    track_provider_defer_validation: bool = False
+
+    playlist_index_enabled: bool = True
+    playlist_metadata_cache_max_size: PositiveInt = 1000
+    playlist_metadata_concurrency: PositiveInt = 4
+    playlist_revalidation_interval: PositiveInt = 60000
+    track_catalog_path: Path | None = None
+    unusable_entry_cache_max_size: PositiveInt = 100
+
+    track_fetcher_spotify_concurrency: PositiveInt = 4
+    track_fetcher_musicbrainz_concurrency: PositiveInt = 2
+
+    release_year_cache_max_size: PositiveInt = 10000
+    track_correction_cache_max_size: PositiveInt = 10000
+    track_correction_cache_ttl: PositiveInt = 300000
 
     sentry_dsn: str | None = None
 
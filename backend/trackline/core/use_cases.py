@@ -8,10 +8,12 @@ from pydantic import BaseModel
 
 from trackline.core.db.client import DatabaseClient
 from trackline.core.db.unit_of_work import TransactionConflictError, UnitOfWork
+from trackline.core.deadline import DeadlineExceededError, deadline
 from trackline.core.exceptions import RequestError
 from trackline.core.fields import ResourceId
 from trackline.core.notifications.notifier import Notifier
 from trackline.core.settings import Settings
+from trackline.core.utils import to_snake_case
 
 log = logging.getLogger(__name__)
 
@@ -88,6 +90,21 @@ class UseCaseExecutor:
         self,
         use_case: AnonymousUseCase[TResult] | AuthenticatedUseCase[TResult],
         user_id: ResourceId | None = None,
+    ) -> TResult:
+        try:
+            with deadline(self._get_deadline_budget(use_case)):
+                return await self._execute_with_retries(use_case, user_id)
+        except DeadlineExceededError as e:
+            raise RequestError(
+                code="DEADLINE_EXCEEDED",
+                message="The request could not be executed in time.",
+                status_code=503,
+            ) from e
+
+    async def _execute_with_retries[TResult](
+        self,
+        use_case: AnonymousUseCase[TResult] | AuthenticatedUseCase[TResult],
+        user_id: ResourceId | None,
     ) -> TResult:
         attempts = 0
         while True:
@@ -108,11 +125,13 @@ class UseCaseExecutor:
                         status_code=409,
                     ) from e
 
+                self._unit_of_work.discard_commit_callbacks()
                 self._notifier.clear()
                 await asyncio.sleep(self._get_retry_interval(attempts))
 
                 continue
 
+            self._unit_of_work.run_commit_callbacks()
             await self._notifier.flush()
             return result
 
@@ -141,6 +160,16 @@ class UseCaseExecutor:
 
         return result
 
+    def _get_deadline_budget(
+        self,
+        use_case: AnonymousUseCase[Any] | AuthenticatedUseCase[Any],
+    ) -> float | None:
+        use_case_name = to_snake_case(type(use_case).__name__)
+        if budget := self._settings.use_case_deadlines.get(use_case_name):
+            return budget / 1000
+
+        return None
+
     def _get_retry_interval(self, attempts: int) -> float:
         base_interval = self._settings.db_txn_retries_min_interval * 2 ** (attempts - 1)
         jitter = random.randrange(0, self._settings.db_txn_retries_jitter)  # noqa: S311
@@ -1,6 +1,7 @@
 import random
 import re
-from collections.abc import Iterable
+from collections.abc import Container, Iterable, Iterator
+from typing import Any
 
 
 def list_or_none[T](lst: Iterable[T] | None) -> list[T] | None:
@@ -13,6 +14,35 @@ def shuffle[T](seq: Iterable[T]) -> list[T]:
     return copy
 
 
+def lazy_shuffle(n: int, seed: int | None = None) -> Iterator[int]:
+    """
+    Yield a uniformly random permutation of `range(n)` on demand.
+
+    This is a Fisher-Yates shuffle that only keeps track of swapped positions,
+    so memory grows with the number of consumed items instead of with `n`.
+    """
+    rng = random.Random(seed)  # noqa: S311
+    swapped: dict[int, int] = {}
+    for last in range(n - 1, -1, -1):
+        index = rng.randint(0, last)
+        value = swapped.get(index, index)
+        last_value = swapped.pop(last, last)
+        if index != last:
+            swapped[index] = last_value
+
+        yield value
+
+
+class ContainerUnion[T](Container[T]):
+    """Membership test over several containers without copying their items."""
+
+    def __init__(self, *containers: Container[T]) -> None:
+        self._containers: tuple[Container[Any], ...] = containers
+
+    def __contains__(self, item: object) -> bool:
+        return any(item in c for c in self._containers)
+
+
 def to_snake_case(name: str) -> str:
     name = re.sub("(.)([A-Z][a-z]+)", r"\1_\2", name)
     name = re.sub("__([A-Z])", r"_\1", name)
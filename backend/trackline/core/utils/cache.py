@@ -0,0 +1,36 @@
+import time
+from collections import OrderedDict
+
+
+class LruCache[K, V]:
+    def __init__(self, max_size: int, ttl: float | None = None) -> None:
+        self._max_size = max_size
+        self._ttl = ttl
+
+        self._entries: OrderedDict[K, tuple[V, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> V:
+        value, expiration_time = self._entries[key]
+        if expiration_time <= time.monotonic():
+            del self._entries[key]
+            raise KeyError(key)
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        expiration_time = time.monotonic() + self._ttl if self._ttl else float("inf")
+        self._entries[key] = (value, expiration_time)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: K) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
@@ -0,0 +1,23 @@
+from httpx import AsyncHTTPTransport, Limits, Timeout
+
+from trackline.core.settings import Settings
+
+
+def create_transport(settings: Settings) -> AsyncHTTPTransport:
+    """Create a transport for outbound requests with the configured connection pool."""
+    # HTTP/2 is negotiated with TLS, so servers without support fall back to HTTP/1.1
+    return AsyncHTTPTransport(
+        http2=settings.http2_enabled,
+        limits=Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry / 1000,
+        ),
+    )
+
+
+def create_timeout(settings: Settings) -> Timeout:
+    return Timeout(
+        settings.http_timeout / 1000,
+        pool=settings.http_pool_timeout / 1000,
+    )
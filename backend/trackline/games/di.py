@@ -1,10 +1,40 @@
-from injector import Binder, Module, singleton
+from injector import Binder, Module, provider, singleton
 
+from trackline.core.settings import Settings
+from trackline.games.services.music_brainz_client import MusicBrainzClient
 from trackline.games.services.music_brainz_lookup import MusicBrainzLookup
+from trackline.games.services.music_brainz_rate_limiter import MusicBrainzRateLimiter
+from trackline.games.services.playlist_revalidator import PlaylistMetadataCache
+from trackline.games.services.prefetch_planner import PrefetchPlanner
+from trackline.games.services.release_year_cache import ReleaseYearCache
 from trackline.games.services.track_cache import TrackCache
+from trackline.games.services.track_catalog import (
+    EmptyTrackCatalog,
+    FileTrackCatalog,
+    TrackCatalog,
+)
+from trackline.games.services.track_correction_cache import TrackCorrectionCache
+from trackline.games.services.track_pool import TrackPool
+from trackline.games.services.unusable_entry_cache import UnusableEntryCache
 
 
 class GamesModule(Module):
     def configure(self, binder: Binder) -> None:
+        binder.bind(MusicBrainzClient, scope=singleton)
         binder.bind(MusicBrainzLookup, scope=singleton)
+        binder.bind(MusicBrainzRateLimiter, scope=singleton)
+        binder.bind(PlaylistMetadataCache, scope=singleton)
+        binder.bind(PrefetchPlanner, scope=singleton)
+        binder.bind(ReleaseYearCache, scope=singleton)
         binder.bind(TrackCache, scope=singleton)
+        binder.bind(TrackCorrectionCache, scope=singleton)
+        binder.bind(TrackPool, scope=singleton)
+        binder.bind(UnusableEntryCache, scope=singleton)
+
+    @singleton
+    @provider
+    def provide_track_catalog(self, settings: Settings) -> TrackCatalog:
+        if settings.track_catalog_path:
+            return FileTrackCatalog(settings.track_catalog_path)
+
+        return EmptyTrackCatalog()
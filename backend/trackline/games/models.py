@@ -1,14 +1,16 @@
 import abc
+from collections.abc import Set as AbstractSet
 from datetime import UTC, datetime
 from enum import StrEnum
 from uuid import uuid4
 
 from beanie import Replace, SaveChanges, Update, before_event
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 from trackline.core.db.models import BaseDocument
 from trackline.core.fields import ResourceId
 from trackline.core.utils.datetime import utcnow
+from trackline.spotify.models import SpotifyTrack
 
 
 class GameState(StrEnum):
@@ -150,6 +152,7 @@ class Turn(BaseModel):
 
 class Playlist(BaseModel):
     spotify_id: str
+    snapshot_id: str | None = None
     track_count: int
 
 
@@ -178,6 +181,26 @@ class Game(BaseDocument):
     players: list[Player] = Field(default_factory=list[Player])
     discarded_track_ids: list[str] = Field(default_factory=list[str])
 
+    _used_track_ids: set[str] | None = PrivateAttr(default=None)
+
+    @property
+    def used_track_ids(self) -> AbstractSet[str]:
+        """
+        Spotify ids of all tracks that have been dealt, played or discarded.
+
+        The set is built once per loaded game and kept up to date by the methods
+        that add tracks to the game, so turns, timelines and discarded tracks must
+        be modified through these methods.
+        """
+        if self._used_track_ids is None:
+            self._used_track_ids = {
+                *(t.spotify_id for p in self.players for t in p.timeline),
+                *(t.track.spotify_id for t in self.turns),
+                *self.discarded_track_ids,
+            }
+
+        return self._used_track_ids
+
     @property
     def round_number(self) -> int:
         return self.turns[-1].round_number if self.turns else 1
@@ -230,10 +253,32 @@ class Game(BaseDocument):
 
         raise ValueError("This game has no players")
 
+    def add_turn(self, turn: Turn) -> None:
+        self.turns.append(turn)
+        self._add_used_track_id(turn.track.spotify_id)
+
+    def exchange_track(self, turn: Turn, track: Track) -> None:
+        self.discarded_track_ids.append(turn.track.spotify_id)
+        turn.track = track
+        self._add_used_track_id(track.spotify_id)
+
+    def add_to_timeline(
+        self,
+        player: Player,
+        track: Track,
+        index: int | None = None,
+    ) -> None:
+        player.add_to_timeline(track, index)
+        self._add_used_track_id(track.spotify_id)
+
     def complete(self, state: GameState) -> None:
         self.state = state
         self.completion_time = datetime.now(UTC)
 
+    def _add_used_track_id(self, track_id: str) -> None:
+        if self._used_track_ids is not None:
+            self._used_track_ids.add(track_id)
+
     class Settings(BaseDocument.Settings):
         name = "game"
 
@@ -250,3 +295,37 @@ class TrackCorrection(BaseDocument):
 
     class Settings(BaseDocument.Settings):
         name = "track_correction"
+
+
+class PlaylistSnapshot(BaseDocument):
+    playlist_spotify_id: str
+    snapshot_id: str
+    market: str | None = None
+    tracks: list[SpotifyTrack]
+    creation_time: datetime = Field(default_factory=utcnow)
+
+    class Settings(BaseDocument.Settings):
+        name = "playlist_snapshot"
+
+
+class UnusablePlaylistEntries(BaseDocument):
+    playlist_spotify_id: str
+    snapshot_id: str
+    market: str | None = None
+    track_indices: list[int] = Field(default_factory=list[int])
+    creation_time: datetime = Field(default_factory=utcnow)
+
+    class Settings(BaseDocument.Settings):
+        name = "unusable_playlist_entries"
+
+
+class ReleaseYearCacheEntry(BaseDocument):
+    key: str
+    # Version of the lookup heuristics that resolved the release year
+    version: int
+    # Tracks unknown to MusicBrainz are cached as well
+    release_year: int | None = None
+    creation_time: datetime = Field(default_factory=utcnow)
+
+    class Settings(BaseDocument.Settings):
+        name = "release_year_cache"
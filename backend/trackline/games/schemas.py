@@ -419,6 +419,11 @@ class TrackExchanged(Notification):
     token_delta: Mapping[ResourceId, int]
 
 
+class TrackUpdated(Notification):
+    turn_revision_id: str
+    track: TrackOut
+
+
 class ReleaseYearGuessCreated(Notification):
     guess: ReleaseYearGuessOut
 
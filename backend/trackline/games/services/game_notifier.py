@@ -33,7 +33,7 @@ class GameNotifier:
         self._channel_manager.unregister(channel)
 
     async def notify(
-        self, user_id: ResourceId, game: Game, notification: Notification
+        self, user_id: ResourceId | None, game: Game, notification: Notification
     ) -> None:
         if not game.id:
             raise ValueError("The game must have an id")
@@ -1,4 +1,6 @@
+import asyncio
 import logging
+from dataclasses import dataclass
 from typing import Annotated
 
 from httpx import AsyncClient, ConnectError, HTTPError
@@ -7,12 +9,34 @@ from injector import Inject
 from pydantic import BaseModel, ConfigDict, Field
 
 from trackline.constants import APP_NAME
+from trackline.core.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerTransport,
+    CircuitOpenError,
+    CircuitState,
+)
+from trackline.core.deadline import (
+    DeadlineExceededError,
+    copy_context_without_deadline,
+    get_remaining_time,
+)
+from trackline.core.metrics import Metrics
 from trackline.core.settings import Settings
+from trackline.core.utils.http import create_timeout, create_transport
 from trackline.core.utils.version import get_version
+from trackline.games.services.music_brainz_rate_limiter import (
+    MusicBrainzRateLimiter,
+    RateLimitedTransport,
+)
 
 log = logging.getLogger(__name__)
 
 
+class MusicBrainzError(Exception):
+    def __init__(self) -> None:
+        super().__init__("The MusicBrainz request failed")
+
+
 class MusicBrainzModel(BaseModel):
     model_config = ConfigDict(
         alias_generator=lambda field_name: field_name.replace("_", "-")
@@ -65,51 +89,148 @@ class Recording(MusicBrainzModel):
     first_release_date: str | None = None
 
 
+@dataclass
+class PendingRequest:
+    task: asyncio.Task[list[Recording]]
+    waiter_count: int = 0
+
+
 class MusicBrainzClient:
-    def __init__(self, settings: Inject[Settings]) -> None:
+    def __init__(
+        self,
+        settings: Inject[Settings],
+        metrics: Inject[Metrics],
+        rate_limiter: Inject[MusicBrainzRateLimiter],
+    ) -> None:
         self._settings = settings
+        self._metrics = metrics
+        self._rate_limiter = rate_limiter
+        self._circuit_breaker = CircuitBreaker(
+            "musicbrainz",
+            metrics,
+            failure_threshold=settings.musicbrainz_circuit_failure_threshold,
+            reset_timeout=settings.musicbrainz_circuit_reset_timeout / 1000,
+        )
         self._client = AsyncClient(
-            base_url="https://musicbrainz.org/ws/2/",
+            base_url=settings.musicbrainz_api_url,
             headers={"user-agent": self._get_user_agent()},
-            transport=RetryTransport(
-                retry=Retry(
-                    total=settings.musicbrainz_retries_max_attempts,
-                    backoff_factor=settings.musicbrainz_retries_min_interval / 1000,
-                )
+            timeout=create_timeout(settings),
+            transport=CircuitBreakerTransport(
+                RetryTransport(
+                    # Retries pass the rate limiter as well
+                    transport=RateLimitedTransport(
+                        create_transport(settings), rate_limiter
+                    ),
+                    retry=Retry(
+                        total=settings.musicbrainz_retries_max_attempts,
+                        backoff_factor=settings.musicbrainz_retries_min_interval / 1000,
+                    ),
+                ),
+                self._circuit_breaker,
             ),
         )
 
+        # Identical queries that are in flight share a single request
+        self._pending_requests: dict[tuple[str, int | None], PendingRequest] = {}
+
+    @property
+    def is_available(self) -> bool:
+        return self._circuit_breaker.state != CircuitState.OPEN
+
     async def close(self) -> None:
         await self._client.aclose()
 
     async def get_recordings(
         self, query: str, limit: int | None = None
     ) -> list[Recording]:
+        key = (query, limit)
+        if request := self._pending_requests.get(key):
+            self._metrics.increment("musicbrainz.coalesced_requests")
+        else:
+            request = self._start_request(key, query, limit)
+
+        # Each caller only waits until its own deadline. Cancelling one caller must
+        # not cancel the request for the others, but the request is cancelled once
+        # nobody waits for it anymore, so that it doesn't hold up the rate limiter.
+        request.waiter_count += 1
+        try:
+            async with asyncio.timeout(get_remaining_time()):
+                return await asyncio.shield(request.task)
+        except TimeoutError as e:
+            log.warning("MusicBrainz request abandoned due to the deadline")
+            raise MusicBrainzError from e
+        finally:
+            request.waiter_count -= 1
+            if not request.waiter_count and not request.task.done():
+                del self._pending_requests[key]
+                request.task.cancel()
+
+    def _start_request(
+        self,
+        key: tuple[str, int | None],
+        query: str,
+        limit: int | None,
+    ) -> PendingRequest:
+        # Don't queue up a request that can't be sent before the deadline
+        try:
+            self._rate_limiter.check_deadline()
+        except DeadlineExceededError as e:
+            log.warning("MusicBrainz request skipped due to the deadline")
+            raise MusicBrainzError from e
+
+        # The request is shared by callers with different deadlines, so it must not
+        # be limited by the deadline of the first one
+        task = asyncio.create_task(
+            self._get_recordings(query, limit),
+            context=copy_context_without_deadline(),
+        )
+        request = PendingRequest(task)
+        task.add_done_callback(lambda _: self._on_request_done(key, request))
+        self._pending_requests[key] = request
+
+        return request
+
+    def _on_request_done(
+        self, key: tuple[str, int | None], request: PendingRequest
+    ) -> None:
+        # Cancelled requests have been removed already and may have been replaced
+        if self._pending_requests.get(key) is request:
+            del self._pending_requests[key]
+        # Mark the exception as retrieved, in case all callers have been cancelled
+        if not request.task.cancelled():
+            request.task.exception()
+
+    async def _get_recordings(
+        self, query: str, limit: int | None = None
+    ) -> list[Recording]:
+        self._metrics.increment("musicbrainz.requests")
         try:
             response = await self._client.get(
                 "recording",
                 params={"query": query, "limit": limit, "fmt": "json"},
             )
-        except ConnectError:
+        except CircuitOpenError as e:
+            raise MusicBrainzError from e
+        except ConnectError as e:
             log.exception("MusicBrainz request failed due to connection error")
-            return []
-        except HTTPError:
+            raise MusicBrainzError from e
+        except HTTPError as e:
             log.exception("MusicBrainz request failed due to HTTP error")
-            return []
+            raise MusicBrainzError from e
 
         if not response.is_success:
-            log.exception(
+            log.error(
                 "MusicBrainz request failed with status code %s",
                 response.status_code,
             )
-            return []
+            raise MusicBrainzError
 
         try:
             items = response.json().get("recordings", [])
             return [Recording.model_validate(item) for item in items]
-        except ValueError:
+        except ValueError as e:
             log.exception("Failed to parse MusicBrainz response")
-            return []
+            raise MusicBrainzError from e
 
     def _get_user_agent(self) -> str:
         user_agent = APP_NAME
@@ -7,7 +7,12 @@ from functools import reduce
 from injector import inject
 from lucenequerybuilder import Q
 
-from trackline.games.services.music_brainz_client import MusicBrainzClient, Recording
+from trackline.core.deadline import is_deadline_exceeded
+from trackline.games.services.music_brainz_client import (
+    MusicBrainzClient,
+    MusicBrainzError,
+    Recording,
+)
 from trackline.games.services.track_metadata_parser import (
     ArtistType,
     TrackMetadata,
@@ -18,7 +23,14 @@ from trackline.games.utils import tokenize_string
 log = logging.getLogger(__name__)
 
 
+class ReleaseYearLookupError(Exception):
+    def __init__(self) -> None:
+        super().__init__("The release year lookup could not be completed")
+
+
 class MusicBrainzLookup:
+    # Increment when changing the lookup heuristics to invalidate cached results
+    VERSION = 1
     MAX_LIMIT = 100
     MIN_SIMILARITY_SCORE = 0.7
     SECONDARY_TITLE_PATTERN = r"\s*(\(.+?\)|\[.*?\])\s*"
@@ -33,12 +45,30 @@ class MusicBrainzLookup:
     def __init__(self, client: MusicBrainzClient) -> None:
         self._client = client
 
+    @property
+    def is_available(self) -> bool:
+        """Whether MusicBrainz is expected to respond, i.e. its circuit isn't open."""
+        return self._client.is_available
+
     async def get_release_year(self, metadata: TrackMetadata) -> int | None:
+        try:
+            return await self.resolve_release_year(metadata)
+        except ReleaseYearLookupError:
+            return None
+
+    async def resolve_release_year(self, metadata: TrackMetadata) -> int | None:
+        """
+        Unlike get_release_year, raise ReleaseYearLookupError if the lookup could
+        not be completed, e.g. due to failed requests or the deadline. A result of
+        None therefore means that MusicBrainz doesn't know the track.
+        """
         for tokenize in (False, True):
             if release_year := await self._get_release_year(
                 metadata, tokenize=tokenize
             ):
                 return release_year
+            if is_deadline_exceeded():
+                raise ReleaseYearLookupError
 
         main_artists = [
             a for a in metadata.artists if a.artist_type in self.MAIN_ARTIST_TYPES
@@ -48,7 +78,7 @@ class MusicBrainzLookup:
         ]
         if len(main_artists) > 1:
             metadata = replace(metadata, artists=(main_artists[0], *extra_artists))
-            return await self.get_release_year(metadata)
+            return await self.resolve_release_year(metadata)
 
         return None
 
@@ -80,7 +110,12 @@ class MusicBrainzLookup:
         queries += [~Q("comment", text) for text in self.COMMENT_IGNORE_LIST]
 
         query = reduce(lambda q1, q2: q1 & q2, queries)
-        recordings = await self._client.get_recordings(str(query), limit=self.MAX_LIMIT)
+        try:
+            recordings = await self._client.get_recordings(
+                str(query), limit=self.MAX_LIMIT
+            )
+        except MusicBrainzError as e:
+            raise ReleaseYearLookupError from e
 
         return self._find_min_release_year(recordings, metadata)
 
@@ -0,0 +1,97 @@
+import asyncio
+import time
+
+from fastapi import status
+from httpx import AsyncBaseTransport, Request, Response
+from injector import inject
+
+from trackline.core.deadline import DeadlineExceededError, get_remaining_time
+from trackline.core.settings import Settings
+
+
+class MusicBrainzRateLimiter:
+    """
+    Spaces out all requests of the process to MusicBrainz, which allows about one
+    request per second per user agent and responds with 503 beyond that.
+    """
+
+    @inject
+    def __init__(self, settings: Settings) -> None:
+        self._settings = settings
+
+        self._next_request_time = time.monotonic()
+        self._lock = asyncio.Lock()
+        self._waiter_count = 0
+
+    async def acquire(self) -> None:
+        """
+        Wait until the next request may be sent. Raises DeadlineExceededError right
+        away if that is after the deadline of the current context.
+        """
+        self.check_deadline()
+        self._waiter_count += 1
+        try:
+            async with self._lock:
+                # A Retry-After header may have postponed the request in the meantime
+                self._check_deadline(self._next_request_time)
+                delay = self._next_request_time - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+                self._next_request_time = (
+                    time.monotonic()
+                    + self._settings.musicbrainz_request_interval / 1000
+                )
+        finally:
+            self._waiter_count -= 1
+
+    def check_deadline(self) -> None:
+        """
+        Raise DeadlineExceededError if the next request can't be sent before the
+        deadline of the current context.
+        """
+        # Waiting callers are served in order, as they queue up on the lock, so each
+        # of them delays the request by another interval
+        interval = self._settings.musicbrainz_request_interval / 1000
+        self._check_deadline(self._next_request_time + self._waiter_count * interval)
+
+    def on_response(self, response: Response) -> None:
+        if response.status_code != status.HTTP_503_SERVICE_UNAVAILABLE:
+            return
+
+        try:
+            retry_after = float(response.headers["Retry-After"])
+        except (KeyError, ValueError):
+            return
+
+        self._next_request_time = max(
+            self._next_request_time, time.monotonic() + retry_after
+        )
+
+    def _check_deadline(self, request_time: float) -> None:
+        remaining_time = get_remaining_time()
+        if (
+            remaining_time is not None
+            and request_time - time.monotonic() > remaining_time
+        ):
+            raise DeadlineExceededError
+
+
+class RateLimitedTransport(AsyncBaseTransport):
+    def __init__(
+        self,
+        transport: AsyncBaseTransport,
+        rate_limiter: MusicBrainzRateLimiter,
+    ) -> None:
+        self._transport = transport
+        self._rate_limiter = rate_limiter
+
+    async def handle_async_request(self, request: Request) -> Response:
+        await self._rate_limiter.acquire()
+        response = await self._transport.handle_async_request(request)
+        self._rate_limiter.on_response(response)
+
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
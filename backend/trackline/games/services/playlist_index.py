@@ -0,0 +1,123 @@
+import logging
+
+from injector import inject
+
+from trackline.core.db.repository import Repository
+from trackline.core.settings import Settings
+from trackline.core.utils.datetime import utcnow
+from trackline.games.models import Playlist, PlaylistSnapshot
+from trackline.games.services.playlist_revalidator import PlaylistRevalidator
+from trackline.spotify.services.spotify_client import SpotifyClient
+
+log = logging.getLogger(__name__)
+
+
+class PlaylistIndex:
+    """
+    Persistent index of the full track list of playlists.
+
+    Snapshots are keyed by the playlist's Spotify snapshot id and market, so that
+    they become obsolete as soon as the playlist is modified on Spotify.
+    """
+
+    @inject
+    def __init__(
+        self,
+        settings: Settings,
+        repository: Repository,
+        spotify_client: SpotifyClient,
+        playlist_revalidator: PlaylistRevalidator,
+    ) -> None:
+        self._settings = settings
+        self._repository = repository
+        self._spotify_client = spotify_client
+        self._playlist_revalidator = playlist_revalidator
+
+    async def get(
+        self,
+        playlist: Playlist,
+        snapshot_id: str,
+        market: str | None = None,
+    ) -> PlaylistSnapshot | None:
+        if not self._settings.playlist_index_enabled:
+            return None
+
+        return await self._find(playlist, snapshot_id, market)
+
+    async def build(
+        self,
+        playlist: Playlist,
+        market: str | None = None,
+    ) -> None:
+        if not self._settings.playlist_index_enabled:
+            return
+
+        sp_playlist = await self._playlist_revalidator.revalidate(
+            playlist,
+            market=market,
+        )
+        query = self._get_query(playlist, sp_playlist.snapshot_id, market)
+        if await self._repository.exists(PlaylistSnapshot, query):
+            return
+
+        tracks = await self._spotify_client.get_playlist_tracks(
+            playlist.spotify_id,
+            market=market,
+        )
+
+        # Snapshots are shared by all games and may be built by several processes at
+        # once, so they are upserted outside of the transaction of the use case
+        await self._repository.bulk_upsert(
+            PlaylistSnapshot,
+            [
+                (
+                    query,
+                    {
+                        "$setOnInsert": {
+                            "tracks": [t.model_dump() for t in tracks],
+                            "creation_time": utcnow(),
+                        }
+                    },
+                )
+            ],
+        )
+
+        # Snapshots of previous versions of the playlist will never be used again
+        await self._repository.bulk_delete(
+            PlaylistSnapshot,
+            {
+                "playlist_spotify_id": playlist.spotify_id,
+                "market": market,
+                "snapshot_id": {"$ne": sp_playlist.snapshot_id},
+            },
+        )
+
+        log.info(
+            "Indexed %d track(s) of playlist %s (snapshot %s)",
+            len(tracks),
+            playlist.spotify_id,
+            sp_playlist.snapshot_id,
+        )
+
+    async def _find(
+        self,
+        playlist: Playlist,
+        snapshot_id: str,
+        market: str | None,
+    ) -> PlaylistSnapshot | None:
+        return await self._repository.get_one(
+            PlaylistSnapshot,
+            self._get_query(playlist, snapshot_id, market),
+        )
+
+    def _get_query(
+        self,
+        playlist: Playlist,
+        snapshot_id: str,
+        market: str | None,
+    ) -> dict[str, str | None]:
+        return {
+            "playlist_spotify_id": playlist.spotify_id,
+            "snapshot_id": snapshot_id,
+            "market": market,
+        }
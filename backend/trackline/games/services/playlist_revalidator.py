@@ -0,0 +1,99 @@
+import asyncio
+import logging
+from collections.abc import Iterable
+
+from injector import inject
+
+from trackline.core.settings import Settings
+from trackline.core.utils.cache import LruCache
+from trackline.games.models import Playlist
+from trackline.spotify.models import SpotifyPlaylist
+from trackline.spotify.services.spotify_client import SpotifyClient
+
+log = logging.getLogger(__name__)
+
+type Key = tuple[str, str | None]
+
+
+class PlaylistMetadataCache:
+    """
+    In-memory cache of the current snapshot of playlists on Spotify. Entries expire
+    after the revalidation interval.
+    """
+
+    @inject
+    def __init__(self, settings: Settings) -> None:
+        self._entries = LruCache[Key, SpotifyPlaylist](
+            settings.playlist_metadata_cache_max_size,
+            ttl=settings.playlist_revalidation_interval / 1000,
+        )
+
+    def get(self, key: Key) -> SpotifyPlaylist:
+        return self._entries.get(key)
+
+    def set(self, key: Key, playlist: SpotifyPlaylist) -> None:
+        self._entries.set(key, playlist)
+
+
+class PlaylistRevalidator:
+    @inject
+    def __init__(
+        self,
+        settings: Settings,
+        spotify_client: SpotifyClient,
+        cache: PlaylistMetadataCache,
+    ) -> None:
+        self._settings = settings
+        self._spotify_client = spotify_client
+        self._cache = cache
+
+    async def get(self, playlist_id: str, market: str | None = None) -> SpotifyPlaylist:
+        key = (playlist_id, market)
+        try:
+            return self._cache.get(key)
+        except KeyError:
+            pass
+
+        sp_playlist = await self._spotify_client.get_playlist(
+            playlist_id, market=market
+        )
+        self._cache.set(key, sp_playlist)
+
+        return sp_playlist
+
+    async def get_many(
+        self,
+        playlist_ids: Iterable[str],
+        market: str | None = None,
+    ) -> list[SpotifyPlaylist]:
+        semaphore = asyncio.Semaphore(self._settings.playlist_metadata_concurrency)
+
+        async def get(playlist_id: str) -> SpotifyPlaylist:
+            async with semaphore:
+                return await self.get(playlist_id, market=market)
+
+        return list(await asyncio.gather(*(get(p) for p in playlist_ids)))
+
+    async def revalidate(
+        self,
+        playlist: Playlist,
+        market: str | None = None,
+    ) -> SpotifyPlaylist:
+        """
+        Update the snapshot id and track count of a playlist in place, if it has
+        changed on Spotify since it was added to the game.
+        """
+        sp_playlist = await self.get(playlist.spotify_id, market=market)
+        if sp_playlist.snapshot_id != playlist.snapshot_id:
+            log.info(
+                "Playlist %s changed from snapshot %s to %s (%d -> %d tracks)",
+                playlist.spotify_id,
+                playlist.snapshot_id,
+                sp_playlist.snapshot_id,
+                playlist.track_count,
+                sp_playlist.track_count,
+            )
+            playlist.snapshot_id = sp_playlist.snapshot_id
+            playlist.track_count = sp_playlist.track_count
+
+        return sp_playlist
@@ -0,0 +1,85 @@
+import math
+from datetime import timedelta
+
+from injector import inject
+
+from trackline.core.fields import ResourceId
+from trackline.core.settings import Settings
+from trackline.core.utils.cache import LruCache
+from trackline.core.utils.datetime import utcnow
+from trackline.games.models import Game
+
+
+class PrefetchPlanner:
+    """
+    Estimates how many tracks to keep in the track cache of a game, so that the
+    cache stays ahead of the game's consumption while it is being replenished.
+    """
+
+    SMOOTHING_FACTOR = 0.3
+    SAFETY_FACTOR = 2
+
+    @inject
+    def __init__(self, settings: Settings) -> None:
+        self._settings = settings
+
+        # Exponentially smoothed fetch duration per track in seconds
+        self._track_latencies = LruCache[ResourceId, float](
+            settings.track_cache_max_size
+        )
+        self._global_track_latency: float | None = None
+
+    def record_fetch(
+        self, game_id: ResourceId, track_count: int, duration: float
+    ) -> None:
+        if not track_count:
+            return
+
+        track_latency = duration / track_count
+        self._track_latencies.set(
+            game_id, self._smooth(self._get_track_latency(game_id), track_latency)
+        )
+        self._global_track_latency = self._smooth(
+            self._global_track_latency, track_latency
+        )
+
+    def get_target_size(self, game: Game) -> int:
+        # The initial tracks of all players and the first turn are needed at once.
+        # Later, all players may buy a track while the next turn is being created.
+        min_size = len(game.current_players) + 1
+        if not game.id or not game.turns:
+            return min_size
+
+        # Exchanged tracks have to be replaced, so turns may consume more than one
+        tracks_per_turn = 1 + len(game.discarded_track_ids) / len(game.turns)
+
+        window = timedelta(milliseconds=self._settings.track_cache_prefetch_window)
+        now = utcnow()
+        recent_turn_count = sum(
+            1 for t in game.turns if now - t.creation_time <= window
+        )
+        track_rate = recent_turn_count * tracks_per_turn / window.total_seconds()
+
+        # Cover the tracks consumed while the tracks of the next turn are fetched
+        refill_duration = (self._get_track_latency(game.id) or 0) * math.ceil(
+            tracks_per_turn
+        )
+        target_size = math.ceil(tracks_per_turn) + math.ceil(
+            self.SAFETY_FACTOR * track_rate * refill_duration
+        )
+
+        # The depth only limits the adaptive target, as large games would otherwise
+        # have to fetch the tracks of their players on the request path
+        return max(min_size, min(target_size, self._settings.track_cache_max_depth))
+
+    def _get_track_latency(self, game_id: ResourceId) -> float | None:
+        try:
+            return self._track_latencies.get(game_id)
+        except KeyError:
+            return self._global_track_latency
+
+    def _smooth(self, current: float | None, sample: float) -> float:
+        if current is None:
+            return sample
+
+        return self.SMOOTHING_FACTOR * sample + (1 - self.SMOOTHING_FACTOR) * current
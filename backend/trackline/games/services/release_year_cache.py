@@ -0,0 +1,143 @@
+from collections.abc import Collection, Mapping
+
+from injector import inject
+
+from trackline.core.db.repository import Repository
+from trackline.core.settings import Settings
+from trackline.core.utils.cache import LruCache
+from trackline.core.utils.datetime import utcnow
+from trackline.games.models import ReleaseYearCacheEntry
+from trackline.games.services.music_brainz_lookup import MusicBrainzLookup
+from trackline.games.services.track_metadata_parser import TrackMetadata
+from trackline.games.utils import tokenize_string
+
+
+def get_track_key(track_id: str) -> str:
+    return f"spotify:{track_id}"
+
+
+def get_metadata_key(metadata: TrackMetadata) -> str:
+    """
+    Key of the normalized metadata, which is shared by copies of a track on
+    different albums, e.g. compilations.
+    """
+    names = sorted(
+        " ".join(sorted(tokenize_string(a.full_name))) for a in metadata.artists
+    )
+    title = " ".join(sorted(tokenize_string(metadata.full_title)))
+    return f"metadata:{'|'.join(names)}|{title}"
+
+
+class ReleaseYearCache:
+    """
+    In-memory map of release years resolved on MusicBrainz by cache key. Tracks
+    unknown to MusicBrainz are cached as None.
+    """
+
+    @inject
+    def __init__(self, settings: Settings) -> None:
+        self._entries = LruCache[str, int | None](settings.release_year_cache_max_size)
+
+    def get(self, key: str) -> int | None:
+        return self._entries.get(key)
+
+    def set(self, key: str, release_year: int | None) -> None:
+        self._entries.set(key, release_year)
+
+
+class ReleaseYearResolver:
+    """
+    Resolves release years on MusicBrainz, caching the results by Spotify id and by
+    normalized metadata. Cached results of previous versions of the lookup are
+    ignored and eventually expire.
+    """
+
+    @inject
+    def __init__(
+        self,
+        repository: Repository,
+        cache: ReleaseYearCache,
+        music_brainz_lookup: MusicBrainzLookup,
+    ) -> None:
+        self._repository = repository
+        self._cache = cache
+        self._music_brainz_lookup = music_brainz_lookup
+
+    @property
+    def is_available(self) -> bool:
+        return self._music_brainz_lookup.is_available
+
+    async def get_many(
+        self,
+        tracks: Mapping[str, TrackMetadata],
+    ) -> dict[str, int | None]:
+        """Get cached release years of the given tracks by Spotify id."""
+        keys = {
+            track_id: (get_track_key(track_id), get_metadata_key(metadata))
+            for track_id, metadata in tracks.items()
+        }
+        release_years = await self._get_many_by_key(
+            {key for track_keys in keys.values() for key in track_keys}
+        )
+
+        result: dict[str, int | None] = {}
+        for track_id, track_keys in keys.items():
+            for key in track_keys:
+                if key in release_years:
+                    result[track_id] = release_years[key]
+                    break
+
+        return result
+
+    async def resolve(self, track_id: str, metadata: TrackMetadata) -> int | None:
+        """
+        Look up the release year on MusicBrainz and cache it. Raises
+        ReleaseYearLookupError if the lookup could not be completed.
+        """
+        release_year = await self._music_brainz_lookup.resolve_release_year(metadata)
+
+        # Entries are cached in memory only once they have been persisted
+        keys = (get_track_key(track_id), get_metadata_key(metadata))
+        creation_time = utcnow()
+        await self._repository.bulk_upsert(
+            ReleaseYearCacheEntry,
+            [
+                (
+                    {"key": key, "version": MusicBrainzLookup.VERSION},
+                    {
+                        "$set": {
+                            "release_year": release_year,
+                            "creation_time": creation_time,
+                        }
+                    },
+                )
+                for key in keys
+            ],
+        )
+        for key in keys:
+            self._cache.set(key, release_year)
+
+        return release_year
+
+    async def _get_many_by_key(self, keys: Collection[str]) -> dict[str, int | None]:
+        release_years: dict[str, int | None] = {}
+        missing_keys: list[str] = []
+        for key in keys:
+            try:
+                release_years[key] = self._cache.get(key)
+            except KeyError:
+                missing_keys.append(key)
+
+        if missing_keys:
+            entries = await self._repository.get_many(
+                ReleaseYearCacheEntry,
+                {
+                    "key": {"$in": missing_keys},
+                    "version": MusicBrainzLookup.VERSION,
+                },
+            )
+            for entry in entries:
+                self._cache.set(entry.key, entry.release_year)
+                release_years[entry.key] = entry.release_year
+
+        return release_years
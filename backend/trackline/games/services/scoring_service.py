@@ -125,9 +125,9 @@ class ScoringService:
                     # The active player guesses the position within their own
                     # timeline, so honor the exact slot they chose.
                     index = self._get_guess_position(player.timeline, guess)
-                    player.add_to_timeline(turn.track, index)
+                    game.add_to_timeline(player, turn.track, index)
                 else:
-                    player.add_to_timeline(turn.track)
+                    game.add_to_timeline(player, turn.track)
             elif is_correct or is_duplicate:
                 # Duplicate guesses are ignored and these players get
                 # their spent token back. There might be multiple correct
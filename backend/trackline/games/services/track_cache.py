@@ -52,6 +52,9 @@ class TrackCache:
 
         return result
 
+    def get_all(self, game_id: ResourceId) -> list[Track]:
+        return list(self._entries.get(game_id, ()))
+
     def size(self, game_id: ResourceId) -> int:
         return len(self._entries.get(game_id, ()))
 
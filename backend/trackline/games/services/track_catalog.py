@@ -0,0 +1,190 @@
+import abc
+import json
+import mmap
+import struct
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import overload
+
+from trackline.spotify.models import SpotifyTrack
+
+type Key = tuple[str, str | None]
+
+
+class InvalidCatalogError(Exception):
+    def __init__(self, path: Path) -> None:
+        super().__init__(f"{path} is not a valid track catalog file")
+        self.path = path
+
+
+@dataclass(frozen=True)
+class CatalogPlaylist:
+    snapshot_id: str
+    tracks: Sequence[SpotifyTrack]
+
+
+class TrackCatalog(abc.ABC):
+    """
+    Source of pre-exported playlists, whose tracks have validated release years.
+    """
+
+    @abc.abstractmethod
+    def get_playlist(
+        self,
+        playlist_id: str,
+        market: str | None = None,
+    ) -> CatalogPlaylist | None:
+        raise NotImplementedError
+
+
+class EmptyTrackCatalog(TrackCatalog):
+    def get_playlist(
+        self,
+        playlist_id: str,
+        market: str | None = None,
+    ) -> CatalogPlaylist | None:
+        return None
+
+
+class MappedTrackList(Sequence[SpotifyTrack]):
+    """Track list of a catalog file that decodes tracks only when accessed."""
+
+    def __init__(self, buffer: mmap.mmap, offset: int, count: int) -> None:
+        self._buffer = buffer
+        self._offset = offset
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    @overload
+    def __getitem__(self, index: int) -> SpotifyTrack: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[SpotifyTrack]: ...
+
+    def __getitem__(self, index: int | slice) -> SpotifyTrack | list[SpotifyTrack]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("Track index out of range")
+
+        start, end = struct.unpack_from("<2Q", self._buffer, self._offset + index * 8)
+        track_id, title, artists, release_year, image_url = json.loads(
+            self._buffer[start:end]
+        )
+        return SpotifyTrack(
+            id=track_id,
+            title=title,
+            artists=artists,
+            release_year=release_year,
+            is_playable=True,
+            image_url=image_url,
+        )
+
+
+class FileTrackCatalog(TrackCatalog):
+    """
+    Catalog stored in a single file, which is memory-mapped so that all processes
+    share its pages and tracks are only read from disk when they are sampled.
+
+    The file starts with a magic number and a JSON header, which maps playlists to
+    the position of their offset table. Each table holds the start offsets of the
+    playlist's track records plus the end offset of the last record. Records are
+    compact JSON arrays.
+    """
+
+    MAGIC = b"TLCAT\x01"
+    HEADER_LENGTH_FORMAT = "<I"
+
+    def __init__(self, path: Path) -> None:
+        with path.open("rb") as file:
+            self._buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._buffer[: len(self.MAGIC)] != self.MAGIC:
+            raise InvalidCatalogError(path)
+
+        header_offset = len(self.MAGIC) + struct.calcsize(self.HEADER_LENGTH_FORMAT)
+        (header_length,) = struct.unpack_from(
+            self.HEADER_LENGTH_FORMAT, self._buffer, len(self.MAGIC)
+        )
+        header = json.loads(self._buffer[header_offset : header_offset + header_length])
+        self._playlists: dict[Key, CatalogPlaylist] = {
+            (entry["playlist_id"], entry["market"]): CatalogPlaylist(
+                snapshot_id=entry["snapshot_id"],
+                tracks=MappedTrackList(self._buffer, entry["offset"], entry["count"]),
+            )
+            for entry in header["playlists"]
+        }
+
+    def get_playlist(
+        self,
+        playlist_id: str,
+        market: str | None = None,
+    ) -> CatalogPlaylist | None:
+        # Tracks are only filtered by playability in the market of the export, so
+        # playlists exported without a market must not be served for any market
+        return self._playlists.get((playlist_id, market))
+
+    @classmethod
+    def write(cls, path: Path, playlists: Mapping[Key, CatalogPlaylist]) -> None:
+        records: list[tuple[Key, CatalogPlaylist, list[bytes]]] = [
+            (key, playlist, [cls._encode_track(t) for t in playlist.tracks])
+            for key, playlist in playlists.items()
+        ]
+
+        # The header contains the offsets of the tables, which in turn depend on
+        # the length of the header. Reserve enough space by encoding the header
+        # with placeholder offsets of the maximum length first.
+        def encode_header(offsets: Sequence[int]) -> bytes:
+            entries = [
+                {
+                    "playlist_id": playlist_id,
+                    "market": market,
+                    "snapshot_id": playlist.snapshot_id,
+                    "offset": offset,
+                    "count": len(track_records),
+                }
+                for ((playlist_id, market), playlist, track_records), offset in zip(
+                    records, offsets, strict=True
+                )
+            ]
+            return json.dumps({"playlists": entries}).encode()
+
+        header_length = len(encode_header([2**64 - 1] * len(records)))
+        body_offset = (
+            len(cls.MAGIC) + struct.calcsize(cls.HEADER_LENGTH_FORMAT) + header_length
+        )
+
+        body = bytearray()
+        table_offsets: list[int] = []
+        for _, _, track_records in records:
+            table_offset = body_offset + len(body)
+            table_offsets.append(table_offset)
+
+            record_offset = table_offset + (len(track_records) + 1) * 8
+            for track_record in track_records:
+                body += struct.pack("<Q", record_offset)
+                record_offset += len(track_record)
+            body += struct.pack("<Q", record_offset)
+            for track_record in track_records:
+                body += track_record
+
+        header = encode_header(table_offsets).ljust(header_length)
+        with path.open("wb") as file:
+            file.write(cls.MAGIC)
+            file.write(struct.pack(cls.HEADER_LENGTH_FORMAT, header_length))
+            file.write(header)
+            file.write(body)
+
+    @staticmethod
+    def _encode_track(track: SpotifyTrack) -> bytes:
+        return json.dumps(
+            [track.id, track.title, track.artists, track.release_year, track.image_url],
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode()
@@ -0,0 +1,85 @@
+from collections.abc import Collection
+
+from injector import inject
+
+from trackline.core.db.repository import Repository
+from trackline.core.db.unit_of_work import UnitOfWork
+from trackline.core.settings import Settings
+from trackline.core.utils.cache import LruCache
+from trackline.games.models import TrackCorrection
+
+
+class TrackCorrectionCache:
+    """
+    In-memory map of corrected release years by Spotify track id.
+
+    Tracks without a correction are cached as well, as they make up the vast
+    majority of lookups. Entries expire after a while, so that corrections made by
+    other processes are picked up eventually.
+    """
+
+    @inject
+    def __init__(self, settings: Settings) -> None:
+        self._entries = LruCache[str, int | None](
+            settings.track_correction_cache_max_size,
+            ttl=settings.track_correction_cache_ttl / 1000,
+        )
+
+    def get(self, track_id: str) -> int | None:
+        return self._entries.get(track_id)
+
+    def set(self, track_id: str, release_year: int | None) -> None:
+        self._entries.set(track_id, release_year)
+
+
+class TrackCorrectionStore:
+    @inject
+    def __init__(
+        self,
+        repository: Repository,
+        unit_of_work: UnitOfWork,
+        cache: TrackCorrectionCache,
+    ) -> None:
+        self._repository = repository
+        self._unit_of_work = unit_of_work
+        self._cache = cache
+
+    async def get_many(self, track_ids: Collection[str]) -> dict[str, int]:
+        release_years: dict[str, int] = {}
+        missing_track_ids: list[str] = []
+        for track_id in track_ids:
+            try:
+                release_year = self._cache.get(track_id)
+            except KeyError:
+                missing_track_ids.append(track_id)
+                continue
+
+            if release_year is not None:
+                release_years[track_id] = release_year
+
+        if missing_track_ids:
+            corrections = await self._repository.get_many(
+                TrackCorrection, {"track_spotify_id": {"$in": missing_track_ids}}
+            )
+            found = {c.track_spotify_id: c.release_year for c in corrections}
+            for track_id in missing_track_ids:
+                self._cache.set(track_id, found.get(track_id))
+            release_years.update(found)
+
+        return release_years
+
+    async def save(self, track_id: str, release_year: int) -> None:
+        correction = await self._repository.get_one(
+            TrackCorrection, {"track_spotify_id": track_id}
+        )
+        if correction:
+            correction.release_year = release_year
+        else:
+            correction = TrackCorrection(
+                track_spotify_id=track_id,
+                release_year=release_year,
+            )
+            await self._repository.create(correction)
+
+        # Other games must not see the correction before it has been persisted
+        self._unit_of_work.on_commit(lambda: self._cache.set(track_id, release_year))
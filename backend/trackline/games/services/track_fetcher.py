@@ -1,39 +1,47 @@
+import asyncio
 import logging
-from collections.abc import Collection, Iterable
+from collections.abc import Collection, Container, Iterable
+from dataclasses import dataclass, replace
 
 from injector import inject
 
-from trackline.core.db.repository import Repository
-from trackline.core.utils import shuffle
-from trackline.games.models import Playlist, Track, TrackCorrection
-from trackline.games.services.music_brainz_lookup import MusicBrainzLookup
+from trackline.core.deadline import get_remaining_time
+from trackline.core.settings import Settings
+from trackline.games.models import Playlist, Track
+from trackline.games.services.music_brainz_lookup import ReleaseYearLookupError
+from trackline.games.services.release_year_cache import ReleaseYearResolver
+from trackline.games.services.track_correction_cache import TrackCorrectionStore
 from trackline.games.services.track_metadata_parser import (
     TrackMetadata,
     TrackMetadataParser,
 )
+from trackline.games.services.track_sampler import TrackSampler
 from trackline.spotify.models import SpotifyTrack
-from trackline.spotify.services.spotify_client import SpotifyClient
 
 log = logging.getLogger(__name__)
 
 
-class PlaylistsExhaustedError(Exception):
-    def __init__(self) -> None:
-        super().__init__("All playlist tracks have been exhausted")
+@dataclass(frozen=True)
+class FetchedTrack:
+    track: Track
+    # Unset if the release year is Spotify's, because MusicBrainz was not consulted
+    is_validated: bool
 
 
 class TrackFetcher:
     @inject
     def __init__(
         self,
-        repository: Repository,
-        spotify_client: SpotifyClient,
-        music_brainz_lookup: MusicBrainzLookup,
+        settings: Settings,
+        track_correction_store: TrackCorrectionStore,
+        track_sampler: TrackSampler,
+        release_year_resolver: ReleaseYearResolver,
         track_metadata_parser: TrackMetadataParser,
     ) -> None:
-        self._repository = repository
-        self._spotify_client = spotify_client
-        self._music_brainz_lookup = music_brainz_lookup
+        self._settings = settings
+        self._track_correction_store = track_correction_store
+        self._track_sampler = track_sampler
+        self._release_year_resolver = release_year_resolver
         self._track_metadata_parser = track_metadata_parser
 
     async def fetch_tracks(
@@ -41,70 +49,162 @@ class TrackFetcher:
         playlists: Iterable[Playlist],
         count: int,
         market: str | None = None,
-        exclude: Collection[str] | None = None,
-    ) -> list[Track]:
-        exclude = exclude or []
-
-        # Build a flat list of (playlist_id, track_index) pairs so that each track,
-        # regardless of which playlist it belongs to, has an equal chance of selection
-        track_indices = [
-            (playlist.spotify_id, index)
-            for playlist in playlists
-            for index in range(playlist.track_count)
+        exclude: Container[str] | None = None,
+        *,
+        validate_release_year: bool = True,
+    ) -> list[FetchedTrack]:
+        sampled_tracks = await self._track_sampler.sample(
+            playlists,
+            count,
+            market=market,
+            exclude=exclude,
+        )
+
+        # Release years of catalog tracks have already been validated on export.
+        # All others are only validated for tracks that are actually returned, so
+        # no MusicBrainz lookups are wasted on discarded candidates.
+        return [
+            *(
+                replace(t, is_validated=True)
+                for t in await self.create_tracks(
+                    [t.track for t in sampled_tracks if t.is_validated],
+                    validate_release_year=False,
+                )
+            ),
+            *await self.create_tracks(
+                [t.track for t in sampled_tracks if not t.is_validated],
+                validate_release_year=validate_release_year,
+            ),
         ]
 
-        result: list[Track] = []
-        for playlist_id, track_index in shuffle(track_indices):
-            sp_track = await self._spotify_client.get_playlist_track(
-                playlist_id,
-                track_index,
-                market=market,
+    async def create_tracks(
+        self,
+        sp_tracks: Collection[SpotifyTrack],
+        *,
+        validate_release_year: bool = True,
+    ) -> list[FetchedTrack]:
+        metadata = {
+            t.id: self._track_metadata_parser.parse(t.artists, t.title)
+            for t in sp_tracks
+        }
+
+        # Corrected release years take precedence over the ones resolved before
+        resolved_release_years = (
+            await self._release_year_resolver.get_many(metadata)
+            if validate_release_year
+            else {}
+        )
+        known_release_years = {
+            t.id: self._merge_release_years(
+                t.release_year, resolved_release_years[t.id]
             )
-            if (
-                not sp_track
-                or not sp_track.is_playable
-                or not sp_track.release_year
-                or sp_track.id in exclude
-            ):
-                continue
-
-            metadata = self._track_metadata_parser.parse(
-                sp_track.artists, sp_track.title
+            for t in sp_tracks
+            if t.release_year and t.id in resolved_release_years
+        }
+        known_release_years |= await self._track_correction_store.get_many(
+            [t.id for t in sp_tracks]
+        )
+
+        semaphore = asyncio.Semaphore(
+            self._settings.track_fetcher_musicbrainz_concurrency
+        )
+        return list(
+            await asyncio.gather(
+                *(
+                    self._create_track(
+                        t,
+                        metadata[t.id],
+                        known_release_years.get(t.id),
+                        semaphore,
+                        validate_release_year=validate_release_year,
+                    )
+                    for t in sp_tracks
+                )
             )
-            release_year = await self._validate_release_year(sp_track, metadata)
+        )
 
-            track = Track(
+    async def _create_track(
+        self,
+        sp_track: SpotifyTrack,
+        metadata: TrackMetadata,
+        known_release_year: int | None,
+        semaphore: asyncio.Semaphore,
+        *,
+        validate_release_year: bool,
+    ) -> FetchedTrack:
+        async with semaphore:
+            release_year, is_validated = await self._validate_release_year(
+                sp_track,
+                metadata,
+                known_release_year,
+                lookup_music_brainz=validate_release_year,
+            )
+
+        return FetchedTrack(
+            Track(
                 spotify_id=sp_track.id,
                 title=metadata.clean_title,
                 artists=sp_track.artists,
                 release_year=release_year,
                 image_url=sp_track.image_url,
-            )
-            result.append(track)
-
-            if len(result) == count:
-                return result
-
-        raise PlaylistsExhaustedError
+            ),
+            is_validated=is_validated,
+        )
 
     async def _validate_release_year(
         self,
         track: SpotifyTrack,
         metadata: TrackMetadata,
-    ) -> int:
+        known_release_year: int | None,
+        *,
+        lookup_music_brainz: bool,
+    ) -> tuple[int, bool]:
+        """
+        Get the release year of the track and whether it has been validated. It is
+        not if MusicBrainz could not be consulted and Spotify's value is used.
+        """
         if not track.release_year:
             raise ValueError("Track has no release year")
 
-        # If the release year has been corrected before, use the corrected value
-        correction = await self._repository.get_one(
-            TrackCorrection, {"track_spotify_id": track.id}
-        )
-        if correction:
-            return correction.release_year
-
-        # Lookup release year on MusicBrainz and use the lower of the two values
-        mb_release_year = await self._music_brainz_lookup.get_release_year(metadata)
-        if mb_release_year is not None:
-            return min(track.release_year, mb_release_year)
+        # If the release year has been corrected or resolved before, use that value
+        if known_release_year is not None:
+            return known_release_year, True
+
+        # Fall back to Spotify's release year while MusicBrainz is unavailable
+        if not lookup_music_brainz or not self._release_year_resolver.is_available:
+            return track.release_year, False
+
+        # Fall back to Spotify's release year if the deadline of the current use case
+        # doesn't leave enough time to wait for MusicBrainz
+        remaining_time = get_remaining_time()
+        if (
+            remaining_time is not None
+            and remaining_time < self._settings.musicbrainz_min_remaining_time / 1000
+        ):
+            log.warning("Skipped MusicBrainz lookup of track %s (deadline)", track.id)
+            return track.release_year, False
+
+        try:
+            async with asyncio.timeout(remaining_time):
+                mb_release_year = await self._release_year_resolver.resolve(
+                    track.id, metadata
+                )
+        except TimeoutError:
+            log.warning("Aborted MusicBrainz lookup of track %s (deadline)", track.id)
+            return track.release_year, False
+        except ReleaseYearLookupError:
+            log.warning("Incomplete MusicBrainz lookup of track %s", track.id)
+            return track.release_year, False
+
+        return self._merge_release_years(track.release_year, mb_release_year), True
+
+    def _merge_release_years(
+        self,
+        release_year: int,
+        mb_release_year: int | None,
+    ) -> int:
+        # Use the lower of the release years of Spotify and MusicBrainz
+        if mb_release_year is None:
+            return release_year
 
-        return track.release_year
+        return min(release_year, mb_release_year)
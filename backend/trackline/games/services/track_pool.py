@@ -0,0 +1,146 @@
+from collections import OrderedDict
+from collections.abc import Collection, Container, Iterable
+
+from injector import inject
+
+from trackline.core.settings import Settings
+from trackline.core.utils import ContainerUnion, shuffle
+from trackline.games.models import Playlist, Track
+from trackline.games.services.track_correction_cache import TrackCorrectionStore
+from trackline.games.services.track_fetcher import TrackFetcher
+from trackline.games.services.track_sampler import PlaylistSourceProvider
+
+type Key = tuple[frozenset[tuple[str, str]], str | None]
+
+
+class TrackPool:
+    """
+    In-memory pool of validated tracks shared by all games that play the same
+    snapshots of playlists in the same market. Pools of previous snapshots are
+    dropped once a pool of newer snapshots of the same playlists is created.
+
+    The pool of a key is a uniformly random sample of its playlists, so drawing
+    from it is as random as sampling the playlists directly.
+    """
+
+    @inject
+    def __init__(self, settings: Settings) -> None:
+        self._settings = settings
+
+        self._entries: OrderedDict[Key, OrderedDict[str, Track]] = OrderedDict()
+        self._total_size = 0
+
+    def get(self, key: Key) -> list[Track]:
+        if key not in self._entries:
+            return []
+
+        self._entries.move_to_end(key)
+        return list(self._entries[key].values())
+
+    def add_many(self, key: Key, tracks: Iterable[Track]) -> None:
+        if key not in self._entries:
+            self._remove_previous_snapshots(key)
+            self._entries[key] = OrderedDict()
+        else:
+            self._entries.move_to_end(key)
+
+        for track in tracks:
+            if track.spotify_id not in self._entries[key]:
+                self._total_size += 1
+            self._entries[key][track.spotify_id] = track
+            self._evict_if_needed()
+
+    def _remove_previous_snapshots(self, key: Key) -> None:
+        snapshot_ids, market = key
+        playlist_ids = {playlist_id for playlist_id, _ in snapshot_ids}
+        for other_key in list(self._entries):
+            other_snapshot_ids, other_market = other_key
+            if other_market == market and playlist_ids == {
+                playlist_id for playlist_id, _ in other_snapshot_ids
+            }:
+                self._total_size -= len(self._entries.pop(other_key))
+
+    def _evict_if_needed(self) -> None:
+        while self._total_size > self._settings.track_pool_max_size:
+            oldest_key = next(iter(self._entries))
+            oldest_entries = self._entries[oldest_key]
+            oldest_entries.popitem(last=False)
+            self._total_size -= 1
+            if not oldest_entries:
+                del self._entries[oldest_key]
+
+
+class PooledTrackFetcher:
+    @inject
+    def __init__(
+        self,
+        settings: Settings,
+        pool: TrackPool,
+        track_fetcher: TrackFetcher,
+        track_correction_store: TrackCorrectionStore,
+        playlist_source_provider: PlaylistSourceProvider,
+    ) -> None:
+        self._settings = settings
+        self._pool = pool
+        self._track_fetcher = track_fetcher
+        self._track_correction_store = track_correction_store
+        self._playlist_source_provider = playlist_source_provider
+
+    async def fetch_tracks(
+        self,
+        playlists: Collection[Playlist],
+        count: int,
+        market: str | None = None,
+        exclude: Container[str] | None = None,
+    ) -> list[Track]:
+        if not self._settings.track_pool_enabled:
+            return [
+                t.track
+                for t in await self._track_fetcher.fetch_tracks(
+                    playlists, count, market=market, exclude=exclude
+                )
+            ]
+
+        exclude = exclude or ()
+        # Tracks removed from a playlist on Spotify must not be served anymore
+        snapshot_ids = await self._playlist_source_provider.get_snapshot_ids(
+            playlists, market=market
+        )
+        key = (frozenset(snapshot_ids.items()), market)
+        pooled_tracks = self._pool.get(key)
+        available_tracks = [t for t in pooled_tracks if t.spotify_id not in exclude]
+        result = await self._apply_corrections(shuffle(available_tracks)[:count])
+
+        # Grow the pool with tracks that are neither pooled nor excluded yet, so that
+        # the pool remains a uniformly random sample of the playlists
+        if tracks_to_fetch := count - len(result):
+            tracks = await self._track_fetcher.fetch_tracks(
+                playlists,
+                tracks_to_fetch,
+                market=market,
+                exclude=ContainerUnion(exclude, {t.spotify_id for t in pooled_tracks}),
+            )
+            # Release years that MusicBrainz could not validate, e.g. because of the
+            # deadline or an open circuit, must not be reused by other games. These
+            # tracks remain unpooled, so they are validated when sampled again.
+            self._pool.add_many(key, [t.track for t in tracks if t.is_validated])
+            result += [t.track.model_copy() for t in tracks]
+
+        return result
+
+    async def _apply_corrections(self, tracks: Collection[Track]) -> list[Track]:
+        # Pooled tracks are shared between games, so they are copied before being
+        # handed out. Corrections may have been made since a track was pooled.
+        corrected_release_years = await self._track_correction_store.get_many(
+            [t.spotify_id for t in tracks]
+        )
+        return [
+            t.model_copy(
+                update={
+                    "release_year": corrected_release_years.get(
+                        t.spotify_id, t.release_year
+                    )
+                }
+            )
+            for t in tracks
+        ]
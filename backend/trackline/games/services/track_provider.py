@@ -4,10 +4,16 @@ from collections.abc import Iterable
 from injector import inject
 
 from trackline.core.background_tasks import BackgroundTaskManager
+from trackline.core.db.unit_of_work import UnitOfWork
+from trackline.core.settings import Settings
+from trackline.core.use_cases import AnonymousUseCase
+from trackline.core.utils import ContainerUnion
 from trackline.games.models import Game, Track
 from trackline.games.services.track_cache import TrackCache
-from trackline.games.services.track_fetcher import PlaylistsExhaustedError, TrackFetcher
+from trackline.games.services.track_fetcher import TrackFetcher
+from trackline.games.services.track_sampler import PlaylistsExhaustedError
 from trackline.games.use_cases.replenish_track_cache import ReplenishTrackCache
+from trackline.games.use_cases.validate_turn_track import ValidateTurnTrack
 
 log = logging.getLogger(__name__)
 
@@ -16,29 +22,47 @@ class TrackProvider:
     @inject
     def __init__(
         self,
+        settings: Settings,
         track_cache: TrackCache,
         track_fetcher: TrackFetcher,
         background_task_manager: BackgroundTaskManager,
+        unit_of_work: UnitOfWork,
     ) -> None:
+        self._settings = settings
         self._track_cache = track_cache
         self._track_fetcher = track_fetcher
         self._background_task_manager = background_task_manager
+        self._unit_of_work = unit_of_work
 
-    async def get_track(self, game: Game) -> Track:
-        if tracks := await self.get_tracks(game, 1):
+    async def get_track(self, game: Game, *, defer_validation: bool = False) -> Track:
+        if tracks := await self.get_tracks(game, 1, defer_validation=defer_validation):
             return tracks[0]
 
         raise PlaylistsExhaustedError
 
-    async def get_tracks(self, game: Game, count: int) -> list[Track]:
+    async def get_tracks(
+        self,
+        game: Game,
+        count: int,
+        *,
+        defer_validation: bool = False,
+    ) -> list[Track]:
+        """
+        Get unplayed tracks for a game, preferably from the track cache.
+
+        If `defer_validation` is set and enabled in the settings, tracks missing in
+        the cache are returned without looking up their release year on MusicBrainz.
+        The lookup is performed in the background instead and the game's turn is
+        updated once it completes. This must only be used for tracks of turns,
+        whose release year isn't revealed before the turn is scored.
+        """
         if not game.id:
             raise ValueError("The game must have an id")
 
-        exclude_ids = self._get_exclude_ids(game)
         result = [
             t
             for t in self._track_cache.pop_many(game.id, count)
-            if t.spotify_id not in exclude_ids
+            if t.spotify_id not in game.used_track_ids
         ]
 
         if tracks_to_fetch := count - len(result):
@@ -48,12 +72,28 @@ class TrackProvider:
                 tracks_to_fetch,
                 count,
             )
-            result += await self._track_fetcher.fetch_tracks(
-                game.settings.playlists,
-                tracks_to_fetch,
-                exclude={*exclude_ids, *(t.spotify_id for t in result)},
-                market=game.settings.spotify_market,
-            )
+            defer_validation &= self._settings.track_provider_defer_validation
+            fetched_tracks = [
+                t.track
+                for t in await self._track_fetcher.fetch_tracks(
+                    game.settings.playlists,
+                    tracks_to_fetch,
+                    exclude=ContainerUnion(
+                        game.used_track_ids, {t.spotify_id for t in result}
+                    ),
+                    market=game.settings.spotify_market,
+                    validate_release_year=not defer_validation,
+                )
+            ]
+            if defer_validation:
+                self._schedule(
+                    ValidateTurnTrack(
+                        game_id=game.id,
+                        track_spotify_ids=[t.spotify_id for t in fetched_tracks],
+                    )
+                )
+
+            result += fetched_tracks
 
         self.replenish_cache(
             game,
@@ -66,16 +106,11 @@ class TrackProvider:
         if not game.id:
             raise ValueError("The game must have an id")
 
-        self._background_task_manager.schedule(
-            ReplenishTrackCache(
-                game=game,
-                exclude=frozenset({*(exclude or ()), *self._get_exclude_ids(game)}),
-            )
-        )
+        self._schedule(ReplenishTrackCache(game=game, exclude=frozenset(exclude or ())))
 
-    def _get_exclude_ids(self, game: Game) -> set[str]:
-        return {
-            *(t.spotify_id for p in game.players for t in p.timeline),
-            *(t.track.spotify_id for t in game.turns),
-            *game.discarded_track_ids,
-        }
+    def _schedule(self, use_case: AnonymousUseCase) -> None:
+        # Background tasks must see the changes of the current use case, and must
+        # not be scheduled again when its transaction is retried
+        self._unit_of_work.on_commit(
+            lambda: self._background_task_manager.schedule(use_case)
+        )
@@ -0,0 +1,301 @@
+import asyncio
+from bisect import bisect_right
+from collections.abc import Container, Iterable, Iterator, Sequence
+from dataclasses import dataclass, field
+from itertools import accumulate, islice
+
+from injector import inject
+
+from trackline.core.deadline import DeadlineExceededError, is_deadline_exceeded
+from trackline.core.settings import Settings
+from trackline.core.utils import lazy_shuffle
+from trackline.games.models import Playlist
+from trackline.games.services.playlist_index import PlaylistIndex
+from trackline.games.services.playlist_revalidator import PlaylistRevalidator
+from trackline.games.services.track_catalog import TrackCatalog
+from trackline.games.services.unusable_entry_cache import UnusableEntryStore
+from trackline.spotify.models import SpotifyTrack
+from trackline.spotify.services.spotify_client import (
+    PlaylistNotFoundError,
+    SpotifyClient,
+)
+
+
+class PlaylistsExhaustedError(Exception):
+    def __init__(self) -> None:
+        super().__init__("All playlist tracks have been exhausted")
+
+
+@dataclass(frozen=True)
+class SampledTrack:
+    track: SpotifyTrack
+    is_validated: bool = False
+
+
+@dataclass
+class PlaylistSource:
+    playlist_id: str
+    snapshot_id: str
+    track_count: int
+    # Tracks available locally, i.e. from the catalog or the playlist index
+    tracks: Sequence[SpotifyTrack] | None = None
+    is_validated: bool = False
+    unusable_indices: set[int] = field(default_factory=set[int])
+    new_unusable_indices: set[int] = field(default_factory=set[int])
+
+
+class PlaylistSourceProvider:
+    @inject
+    def __init__(
+        self,
+        playlist_revalidator: PlaylistRevalidator,
+        playlist_index: PlaylistIndex,
+        unusable_entry_store: UnusableEntryStore,
+        track_catalog: TrackCatalog,
+    ) -> None:
+        self._playlist_revalidator = playlist_revalidator
+        self._playlist_index = playlist_index
+        self._unusable_entry_store = unusable_entry_store
+        self._track_catalog = track_catalog
+
+    async def get_sources(
+        self,
+        playlists: Iterable[Playlist],
+        market: str | None = None,
+    ) -> list[PlaylistSource]:
+        sources: list[PlaylistSource] = []
+        for playlist in playlists:
+            # Playlists of the catalog are sampled without any network requests
+            catalog_playlist = self._track_catalog.get_playlist(
+                playlist.spotify_id,
+                market=market,
+            )
+            if catalog_playlist is not None:
+                sources.append(
+                    PlaylistSource(
+                        playlist_id=playlist.spotify_id,
+                        snapshot_id=catalog_playlist.snapshot_id,
+                        track_count=len(catalog_playlist.tracks),
+                        tracks=catalog_playlist.tracks,
+                        is_validated=True,
+                    )
+                )
+                continue
+
+            try:
+                sp_playlist = await self._playlist_revalidator.revalidate(
+                    playlist,
+                    market=market,
+                )
+            except PlaylistNotFoundError:
+                continue
+
+            # Indexed playlists are sampled locally, all others directly from Spotify
+            snapshot = await self._playlist_index.get(
+                playlist,
+                sp_playlist.snapshot_id,
+                market=market,
+            )
+            if snapshot:
+                source = PlaylistSource(
+                    playlist_id=playlist.spotify_id,
+                    snapshot_id=sp_playlist.snapshot_id,
+                    track_count=len(snapshot.tracks),
+                    tracks=snapshot.tracks,
+                )
+            else:
+                source = PlaylistSource(
+                    playlist_id=playlist.spotify_id,
+                    snapshot_id=sp_playlist.snapshot_id,
+                    track_count=sp_playlist.track_count,
+                    unusable_indices=await self._unusable_entry_store.get(
+                        playlist.spotify_id,
+                        sp_playlist.snapshot_id,
+                        market=market,
+                    ),
+                )
+            sources.append(source)
+
+        return sources
+
+    async def get_snapshot_ids(
+        self,
+        playlists: Iterable[Playlist],
+        market: str | None = None,
+    ) -> dict[str, str]:
+        """Get the current snapshot ids of the playlists that can be sampled."""
+        snapshot_ids: dict[str, str] = {}
+        for playlist in playlists:
+            if catalog_playlist := self._track_catalog.get_playlist(
+                playlist.spotify_id,
+                market=market,
+            ):
+                snapshot_ids[playlist.spotify_id] = catalog_playlist.snapshot_id
+                continue
+
+            try:
+                sp_playlist = await self._playlist_revalidator.revalidate(
+                    playlist,
+                    market=market,
+                )
+            except PlaylistNotFoundError:
+                continue
+            snapshot_ids[playlist.spotify_id] = sp_playlist.snapshot_id
+
+        return snapshot_ids
+
+    async def save_unusable_indices(
+        self,
+        sources: Iterable[PlaylistSource],
+        market: str | None = None,
+    ) -> None:
+        for source in sources:
+            await self._unusable_entry_store.add_many(
+                source.playlist_id,
+                source.snapshot_id,
+                source.new_unusable_indices,
+                market=market,
+            )
+
+
+class TrackSampler:
+    @inject
+    def __init__(
+        self,
+        settings: Settings,
+        spotify_client: SpotifyClient,
+        playlist_source_provider: PlaylistSourceProvider,
+    ) -> None:
+        self._settings = settings
+        self._spotify_client = spotify_client
+        self._playlist_source_provider = playlist_source_provider
+
+    async def sample(
+        self,
+        playlists: Iterable[Playlist],
+        count: int,
+        market: str | None = None,
+        exclude: Container[str] | None = None,
+    ) -> list[SampledTrack]:
+        exclude = exclude or []
+
+        sources = await self._playlist_source_provider.get_sources(
+            playlists, market=market
+        )
+        try:
+            return await self._sample(sources, count, market, exclude)
+        finally:
+            await self._playlist_source_provider.save_unusable_indices(
+                sources, market=market
+            )
+
+    async def _sample(
+        self,
+        sources: Sequence[PlaylistSource],
+        count: int,
+        market: str | None,
+        exclude: Container[str],
+    ) -> list[SampledTrack]:
+        # Pages of playlists that are not indexed, so that a single request to
+        # Spotify serves all candidates located on the same page
+        pages: dict[tuple[str, int], list[SpotifyTrack | None]] = {}
+
+        # Collect candidates in the order of the random permutation, while fetching
+        # the pages of the next few candidates from Spotify concurrently
+        candidates = (
+            (source, track_index)
+            for source, track_index in self._iter_track_indices(sources)
+            if track_index not in source.unusable_indices
+        )
+        result: dict[str, SampledTrack] = {}
+        while len(result) < count:
+            batch = list(
+                islice(candidates, self._settings.track_fetcher_spotify_concurrency)
+            )
+            if not batch:
+                raise PlaylistsExhaustedError
+
+            await self._fetch_pages(batch, market, pages)
+
+            for source, track_index in batch:
+                if source.tracks is not None:
+                    sp_track = source.tracks[track_index]
+                else:
+                    sp_track = self._get_page_track(source, track_index, pages)
+
+                if (
+                    not sp_track
+                    or not sp_track.is_playable
+                    or not sp_track.release_year
+                ):
+                    if source.tracks is None:
+                        source.new_unusable_indices.add(track_index)
+                    continue
+                if sp_track.id in exclude or sp_track.id in result:
+                    continue
+
+                result[sp_track.id] = SampledTrack(sp_track, source.is_validated)
+                if len(result) == count:
+                    break
+
+            # Give up once the budget of the current use case is spent, rather than
+            # fetching pages far past it
+            if len(result) < count and is_deadline_exceeded():
+                raise DeadlineExceededError
+
+        return list(result.values())
+
+    def _iter_track_indices(
+        self,
+        sources: Sequence[PlaylistSource],
+    ) -> Iterator[tuple[PlaylistSource, int]]:
+        # Shuffle the concatenated index space of all playlists so that each track,
+        # regardless of which playlist it belongs to, has an equal chance of selection
+        boundaries = list(accumulate(max(s.track_count, 0) for s in sources))
+        for flat_index in lazy_shuffle(boundaries[-1] if boundaries else 0):
+            source_index = bisect_right(boundaries, flat_index)
+            source_start = boundaries[source_index - 1] if source_index else 0
+            yield sources[source_index], flat_index - source_start
+
+    async def _fetch_pages(
+        self,
+        candidates: Iterable[tuple[PlaylistSource, int]],
+        market: str | None,
+        pages: dict[tuple[str, int], list[SpotifyTrack | None]],
+    ) -> None:
+        page_keys = {
+            self._get_page_key(source, track_index)
+            for source, track_index in candidates
+            if source.tracks is None
+        }
+        missing_page_keys = [key for key in page_keys if key not in pages]
+        fetched_pages = await asyncio.gather(
+            *(
+                self._spotify_client.get_playlist_page(
+                    playlist_id,
+                    offset=page_offset,
+                    market=market,
+                )
+                for playlist_id, page_offset in missing_page_keys
+            )
+        )
+        pages.update(zip(missing_page_keys, fetched_pages, strict=True))
+
+    def _get_page_track(
+        self,
+        source: PlaylistSource,
+        track_index: int,
+        pages: dict[tuple[str, int], list[SpotifyTrack | None]],
+    ) -> SpotifyTrack | None:
+        page_key = self._get_page_key(source, track_index)
+        page = pages[page_key]
+        page_index = track_index - page_key[1]
+        return page[page_index] if page_index < len(page) else None
+
+    def _get_page_key(
+        self,
+        source: PlaylistSource,
+        track_index: int,
+    ) -> tuple[str, int]:
+        page_size = self._spotify_client.MAX_LIMIT
+        return source.playlist_id, track_index - track_index % page_size
@@ -0,0 +1,100 @@
+from collections.abc import Collection, Iterable
+
+from injector import inject
+
+from trackline.core.db.repository import Repository
+from trackline.core.settings import Settings
+from trackline.core.utils.cache import LruCache
+from trackline.core.utils.datetime import utcnow
+from trackline.games.models import UnusablePlaylistEntries
+
+type Key = tuple[str, str, str | None]
+
+
+class UnusableEntryCache:
+    """
+    In-memory cache of playlist entries that can never be used in a game, e.g.
+    because they are not playable in a market or have no release year.
+    """
+
+    @inject
+    def __init__(self, settings: Settings) -> None:
+        self._entries = LruCache[Key, set[int]](settings.unusable_entry_cache_max_size)
+
+    def get(self, key: Key) -> set[int] | None:
+        try:
+            return set(self._entries.get(key))
+        except KeyError:
+            return None
+
+    def add_many(self, key: Key, track_indices: Iterable[int]) -> None:
+        try:
+            entries = self._entries.get(key)
+        except KeyError:
+            entries = set[int]()
+
+        entries.update(track_indices)
+        self._entries.set(key, entries)
+
+
+class UnusableEntryStore:
+    @inject
+    def __init__(self, repository: Repository, cache: UnusableEntryCache) -> None:
+        self._repository = repository
+        self._cache = cache
+
+    async def get(
+        self,
+        playlist_id: str,
+        snapshot_id: str,
+        market: str | None = None,
+    ) -> set[int]:
+        key = (playlist_id, snapshot_id, market)
+        if (track_indices := self._cache.get(key)) is not None:
+            return track_indices
+
+        # Fall back to entries found by other processes or before a restart
+        entries = await self._repository.get_one(
+            UnusablePlaylistEntries, self._get_query(key)
+        )
+        track_indices = set(entries.track_indices) if entries else set[int]()
+        self._cache.add_many(key, track_indices)
+
+        return track_indices
+
+    async def add_many(
+        self,
+        playlist_id: str,
+        snapshot_id: str,
+        track_indices: Collection[int],
+        market: str | None = None,
+    ) -> None:
+        if not track_indices:
+            return
+
+        # Entries are shared by all games, so they are written outside of the
+        # transaction of the use case and cached only once they have been persisted
+        key = (playlist_id, snapshot_id, market)
+        await self._repository.bulk_upsert(
+            UnusablePlaylistEntries,
+            [
+                (
+                    self._get_query(key),
+                    {
+                        "$addToSet": {
+                            "track_indices": {"$each": sorted(track_indices)}
+                        },
+                        "$setOnInsert": {"creation_time": utcnow()},
+                    },
+                )
+            ],
+        )
+        self._cache.add_many(key, track_indices)
+
+    def _get_query(self, key: Key) -> dict[str, str | None]:
+        playlist_id, snapshot_id, market = key
+        return {
+            "playlist_spotify_id": playlist_id,
+            "snapshot_id": snapshot_id,
+            "market": market,
+        }
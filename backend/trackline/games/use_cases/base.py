@@ -11,8 +11,8 @@ from trackline.core.use_cases import AuthenticatedUseCase, AuthenticatedUseCaseH
 from trackline.games.models import Game, Guess, Track, Turn
 from trackline.games.schemas import GameState
 from trackline.games.services.game_notifier import GameNotifier
-from trackline.games.services.track_fetcher import PlaylistsExhaustedError
 from trackline.games.services.track_provider import TrackProvider
+from trackline.games.services.track_sampler import PlaylistsExhaustedError
 
 TResult = TypeVar("TResult", default=None)
 TUseCase = TypeVar("TUseCase", bound=AuthenticatedUseCase[Any])
@@ -140,9 +140,17 @@ class TrackProvidingBaseHandler(BaseHandler[TUseCase, TResult]):
         super().__init__(repository)
         self._track_provider = track_provider
 
-    async def _get_new_track(self, game: Game) -> Track:
+    async def _get_new_track(
+        self,
+        game: Game,
+        *,
+        defer_validation: bool = False,
+    ) -> Track:
         try:
-            return await self._track_provider.get_track(game)
+            return await self._track_provider.get_track(
+                game,
+                defer_validation=defer_validation,
+            )
         except PlaylistsExhaustedError as e:
             raise UseCaseError(
                 "PLAYLISTS_EXHAUSTED",
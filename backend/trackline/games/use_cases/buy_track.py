@@ -48,7 +48,7 @@ class Handler(TrackProvidingBaseHandler[BuyTrack, TrackPurchaseReceiptOut]):
         track = await self._get_new_track(game)
 
         current_player = game.get_player(user_id)
-        current_player.add_to_timeline(track)
+        game.add_to_timeline(current_player, track)
         current_player.tokens -= TOKEN_COST_BUY_TRACK
 
         if not end_condition_met_before and game.end_condition_met:
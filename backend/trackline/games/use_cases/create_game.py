@@ -19,12 +19,10 @@ from trackline.games.models import (
     TitleMatchMode,
 )
 from trackline.games.schemas import GameOut
+from trackline.games.services.playlist_revalidator import PlaylistRevalidator
 from trackline.games.services.track_provider import TrackProvider
 from trackline.games.use_cases.base import BaseHandler
-from trackline.spotify.services.spotify_client import (
-    PlaylistNotFoundError,
-    SpotifyClient,
-)
+from trackline.spotify.services.spotify_client import PlaylistNotFoundError
 
 
 class CreateGame(AuthenticatedUseCase[GameOut]):
@@ -49,11 +47,11 @@ class Handler(BaseHandler[CreateGame, GameOut]):
         self,
         repository: Repository,
         track_provider: TrackProvider,
-        spotify_client: SpotifyClient,
+        playlist_revalidator: PlaylistRevalidator,
     ) -> None:
         super().__init__(repository)
         self._track_provider = track_provider
-        self._spotify_client = spotify_client
+        self._playlist_revalidator = playlist_revalidator
 
     async def execute(self, user_id: ResourceId, use_case: CreateGame) -> GameOut:
         join_code = await self._get_random_join_code()
@@ -116,23 +114,22 @@ class Handler(BaseHandler[CreateGame, GameOut]):
         playlist_ids: list[str],
         spotify_market: str,
     ) -> list[Playlist]:
-        playlists: list[Playlist] = []
-        for playlist_id in playlist_ids:
-            try:
-                track_count = await self._spotify_client.get_playlist_total_tracks(
-                    playlist_id,
-                    market=spotify_market,
-                )
-            except PlaylistNotFoundError as e:
-                raise UseCaseError(
-                    code="PLAYLIST_NOT_FOUND",
-                    message=f"The playlist {playlist_id} does not exist.",
-                ) from e
-
-            playlist = Playlist(
+        try:
+            sp_playlists = await self._playlist_revalidator.get_many(
+                playlist_ids,
+                market=spotify_market,
+            )
+        except PlaylistNotFoundError as e:
+            raise UseCaseError(
+                code="PLAYLIST_NOT_FOUND",
+                message=f"The playlist {e.playlist_id} does not exist.",
+            ) from e
+
+        return [
+            Playlist(
                 spotify_id=playlist_id,
-                track_count=track_count,
+                snapshot_id=sp_playlist.snapshot_id,
+                track_count=sp_playlist.track_count,
             )
-            playlists.append(playlist)
-
-        return playlists
+            for playlist_id, sp_playlist in zip(playlist_ids, sp_playlists, strict=True)
+        ]
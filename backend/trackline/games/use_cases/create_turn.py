@@ -46,7 +46,7 @@ class Handler(TrackProvidingBaseHandler[CreateTurn, TurnOut]):
         if game.is_round_complete and game.settings.enable_catchup:
             catch_up_token_gain = self._handle_catch_up(game)
 
-        track = await self._get_new_track(game)
+        track = await self._get_new_track(game, defer_validation=True)
         next_player = game.get_next_player()
         turn = Turn(
             round_number=round_number,
@@ -56,7 +56,7 @@ class Handler(TrackProvidingBaseHandler[CreateTurn, TurnOut]):
         )
 
         game.state = GameState.GUESSING
-        game.turns.append(turn)
+        game.add_turn(turn)
 
         turn_out = TurnOut.from_model(turn)
         await self._notifier.notify(user_id, game, NewTurn(turn=turn_out))
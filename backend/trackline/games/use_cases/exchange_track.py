@@ -60,10 +60,9 @@ class Handler(TrackProvidingBaseHandler[ExchangeTrack, TrackExchangeOut]):
         for player in game.current_players:
             player.tokens += token_delta.get(player.user_id, 0)
 
-        new_track = await self._get_new_track(game)
+        new_track = await self._get_new_track(game, defer_validation=True)
         new_revision_id = str(uuid4())
-        game.discarded_track_ids.append(turn.track.spotify_id)
-        turn.track = new_track
+        game.exchange_track(turn, new_track)
         turn.revision_id = new_revision_id
         turn.guesses.release_year.clear()
         turn.guesses.credits.clear()
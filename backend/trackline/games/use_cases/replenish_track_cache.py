@@ -1,11 +1,18 @@
 import logging
+import time
+from collections.abc import Mapping
 
 from injector import inject
 
+from trackline.core.db.repository import Repository
 from trackline.core.use_cases import AnonymousUseCase, AnonymousUseCaseHandler
+from trackline.core.utils import ContainerUnion
 from trackline.games.models import Game
+from trackline.games.services.playlist_index import PlaylistIndex
+from trackline.games.services.prefetch_planner import PrefetchPlanner
 from trackline.games.services.track_cache import TrackCache
-from trackline.games.services.track_fetcher import TrackFetcher
+from trackline.games.services.track_pool import PooledTrackFetcher
+from trackline.spotify.services.spotify_client import PlaylistNotFoundError
 
 log = logging.getLogger(__name__)
 
@@ -18,30 +25,104 @@ class ReplenishTrackCache(AnonymousUseCase):
 @ReplenishTrackCache.register_handler
 class Handler(AnonymousUseCaseHandler["ReplenishTrackCache"]):
     @inject
-    def __init__(self, track_cache: TrackCache, track_fetcher: TrackFetcher) -> None:
+    def __init__(
+        self,
+        repository: Repository,
+        track_cache: TrackCache,
+        track_fetcher: PooledTrackFetcher,
+        playlist_index: PlaylistIndex,
+        prefetch_planner: PrefetchPlanner,
+    ) -> None:
+        self._repository = repository
         self._track_cache = track_cache
         self._track_fetcher = track_fetcher
+        self._playlist_index = playlist_index
+        self._prefetch_planner = prefetch_planner
 
     async def execute(self, use_case: ReplenishTrackCache) -> None:
+        # Playlists are revalidated in place, but the game of the use case is a copy
+        # that is never saved, so changed snapshots have to be saved explicitly
+        snapshot_ids = {
+            p.spotify_id: p.snapshot_id for p in use_case.game.settings.playlists
+        }
+        try:
+            await self._replenish(use_case)
+        finally:
+            await self._save_playlist_changes(use_case.game, snapshot_ids)
+
+    async def _replenish(self, use_case: ReplenishTrackCache) -> None:
         if not use_case.game.id:
             return
 
-        target_size = len(use_case.game.current_players) + 1
+        # Indexing runs in the background only, so that requests never have to wait
+        # for a whole playlist to be fetched from Spotify
+        await self._build_playlist_indexes(use_case.game)
+
+        target_size = self._prefetch_planner.get_target_size(use_case.game)
         current_size = self._track_cache.size(use_case.game.id)
         tracks_to_fetch = target_size - current_size
         if tracks_to_fetch <= 0:
             return
 
+        start_time = time.perf_counter()
         tracks = await self._track_fetcher.fetch_tracks(
             use_case.game.settings.playlists,
             tracks_to_fetch,
-            exclude=use_case.exclude,
+            exclude=ContainerUnion(
+                use_case.game.used_track_ids,
+                use_case.exclude,
+                {t.spotify_id for t in self._track_cache.get_all(use_case.game.id)},
+            ),
             market=use_case.game.settings.spotify_market,
         )
+        self._prefetch_planner.record_fetch(
+            use_case.game.id, len(tracks), time.perf_counter() - start_time
+        )
         self._track_cache.add_many(use_case.game.id, tracks)
 
         log.debug(
-            "Cache replenished for game %s: added %d track(s)",
+            "Cache replenished for game %s: added %d track(s), target size %d",
             use_case.game.id,
             len(tracks),
+            target_size,
         )
+
+    async def _build_playlist_indexes(self, game: Game) -> None:
+        for playlist in game.settings.playlists:
+            try:
+                await self._playlist_index.build(
+                    playlist,
+                    market=game.settings.spotify_market,
+                )
+            except PlaylistNotFoundError:
+                log.warning("Cannot index missing playlist %s", playlist.spotify_id)
+
+    async def _save_playlist_changes(
+        self,
+        game: Game,
+        snapshot_ids: Mapping[str, str | None],
+    ) -> None:
+        for playlist in game.settings.playlists:
+            snapshot_id = snapshot_ids.get(playlist.spotify_id)
+            if playlist.snapshot_id == snapshot_id:
+                continue
+
+            # Don't overwrite a snapshot saved by a request in the meantime
+            await self._repository.update_one(
+                Game,
+                {
+                    "_id": game.id,
+                    "settings.playlists": {
+                        "$elemMatch": {
+                            "spotify_id": playlist.spotify_id,
+                            "snapshot_id": snapshot_id,
+                        }
+                    },
+                },
+                {
+                    "$set": {
+                        "settings.playlists.$.snapshot_id": playlist.snapshot_id,
+                        "settings.playlists.$.track_count": playlist.track_count,
+                    }
+                },
+            )
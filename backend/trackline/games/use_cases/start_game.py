@@ -43,7 +43,7 @@ class Handler(TrackProvidingBaseHandler[StartGame, GameOut]):
             count=len(game.current_players),
         )
         for player, track in zip(game.current_players, tracks, strict=False):
-            player.add_to_timeline(track)
+            game.add_to_timeline(player, track)
 
         game.state = GameState.STARTED
 
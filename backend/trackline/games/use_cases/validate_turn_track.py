@@ -0,0 +1,82 @@
+import logging
+
+from injector import inject
+
+from trackline.core.db.repository import Repository
+from trackline.core.fields import ResourceId
+from trackline.core.use_cases import AnonymousUseCase, AnonymousUseCaseHandler
+from trackline.games.models import Game
+from trackline.games.schemas import TrackOut, TrackUpdated
+from trackline.games.services.game_notifier import GameNotifier
+from trackline.games.services.track_fetcher import TrackFetcher
+from trackline.spotify.services.track_cache import SpotifyTrackStore
+
+log = logging.getLogger(__name__)
+
+
+class ValidateTurnTrack(AnonymousUseCase):
+    game_id: ResourceId
+    track_spotify_ids: list[str]
+
+
+@ValidateTurnTrack.register_handler
+class Handler(AnonymousUseCaseHandler["ValidateTurnTrack"]):
+    @inject
+    def __init__(
+        self,
+        repository: Repository,
+        spotify_track_store: SpotifyTrackStore,
+        track_fetcher: TrackFetcher,
+        notifier: GameNotifier,
+    ) -> None:
+        self._repository = repository
+        self._spotify_track_store = spotify_track_store
+        self._track_fetcher = track_fetcher
+        self._notifier = notifier
+
+    async def execute(self, use_case: ValidateTurnTrack) -> None:
+        game = await self._repository.get(Game, use_case.game_id)
+        if not game:
+            return
+
+        sp_tracks = await self._spotify_track_store.get_tracks(
+            use_case.track_spotify_ids,
+            market=game.settings.spotify_market,
+        )
+        # Tracks whose lookup failed again keep the release year of their turn
+        tracks = {
+            t.track.spotify_id: t.track
+            for t in await self._track_fetcher.create_tracks(
+                [t for t in sp_tracks if t and t.release_year]
+            )
+            if t.is_validated
+        }
+
+        # Only patch turns that have not been scored yet, as players would
+        # otherwise see results that don't match the revealed release year
+        for turn in game.turns:
+            track = tracks.get(turn.track.spotify_id)
+            if (
+                not track
+                or turn.scoring
+                or turn.track.release_year == track.release_year
+            ):
+                continue
+
+            log.info(
+                "Release year of track %s in game %s changed from %d to %d",
+                track.spotify_id,
+                game.id,
+                turn.track.release_year,
+                track.release_year,
+            )
+
+            turn.track.release_year = track.release_year
+            await self._notifier.notify(
+                None,
+                game,
+                TrackUpdated(
+                    turn_revision_id=turn.revision_id,
+                    track=TrackOut.from_model(turn.track),
+                ),
+            )
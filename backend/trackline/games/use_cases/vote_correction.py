@@ -9,7 +9,6 @@ from trackline.games.models import (
     CorrectionProposalVote,
     Game,
     GameState,
-    TrackCorrection,
     Turn,
 )
 from trackline.games.schemas import (
@@ -20,6 +19,7 @@ from trackline.games.schemas import (
 )
 from trackline.games.services.game_notifier import GameNotifier
 from trackline.games.services.scoring_service import ScoringService
+from trackline.games.services.track_correction_cache import TrackCorrectionStore
 from trackline.games.use_cases.base import BaseHandler
 
 MIN_VOTES = 0.5
@@ -39,10 +39,12 @@ class Handler(BaseHandler[VoteCorrection, CorrectionProposalVoteResultOut]):
         repository: Repository,
         scoring_service: ScoringService,
         notifier: GameNotifier,
+        track_correction_store: TrackCorrectionStore,
     ) -> None:
         super().__init__(repository)
         self._scoring_service = scoring_service
         self._notifier = notifier
+        self._track_correction_store = track_correction_store
 
     async def execute(
         self, user_id: ResourceId, use_case: VoteCorrection
@@ -103,17 +105,9 @@ class Handler(BaseHandler[VoteCorrection, CorrectionProposalVoteResultOut]):
         if not turn.correction_proposal:
             raise ValueError("Turn has no correction proposal")
 
-        correction = await self._repository.get_one(
-            TrackCorrection, {"track_spotify_id": turn.track.spotify_id}
+        await self._track_correction_store.save(
+            turn.track.spotify_id, turn.correction_proposal.release_year
         )
-        if correction:
-            correction.release_year = turn.correction_proposal.release_year
-        else:
-            correction = TrackCorrection(
-                track_spotify_id=turn.track.spotify_id,
-                release_year=turn.correction_proposal.release_year,
-            )
-            await self._repository.create(correction)
 
         turn.track.release_year = turn.correction_proposal.release_year
 
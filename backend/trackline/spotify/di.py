@@ -1,10 +1,16 @@
 from injector import Binder, Module, singleton
 
 from trackline.spotify.services.auth_provider import SpotifyAuthProvider
+from trackline.spotify.services.http_client import SpotifyHttpClient
+from trackline.spotify.services.rate_limiter import SpotifyRateLimiter
 from trackline.spotify.services.spotify_client import SpotifyClient
+from trackline.spotify.services.track_cache import SpotifyTrackCache
 
 
 class SpotifyModule(Module):
     def configure(self, binder: Binder) -> None:
         binder.bind(SpotifyAuthProvider, scope=singleton)
         binder.bind(SpotifyClient, scope=singleton)
+        binder.bind(SpotifyHttpClient, scope=singleton)
+        binder.bind(SpotifyRateLimiter, scope=singleton)
+        binder.bind(SpotifyTrackCache, scope=singleton)
@@ -1,6 +1,10 @@
+from datetime import datetime
 from enum import StrEnum
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+from trackline.core.db.models import BaseDocument
+from trackline.core.utils.datetime import utcnow
 
 
 class SpotifyProduct(StrEnum):
@@ -17,6 +21,23 @@ class SpotifyTrack(BaseModel):
     image_url: str | None = None
 
 
+class SpotifyPlaylist(BaseModel):
+    id: str
+    snapshot_id: str
+    track_count: int
+
+
 class SpotifyUser(BaseModel):
     id: str
     product: SpotifyProduct | None
+
+
+class CachedSpotifyTrack(BaseDocument):
+    track_spotify_id: str
+    market: str | None = None
+    # Tracks unknown to Spotify are cached as well
+    track: SpotifyTrack | None = None
+    creation_time: datetime = Field(default_factory=utcnow)
+
+    class Settings(BaseDocument.Settings):
+        name = "spotify_track_cache"
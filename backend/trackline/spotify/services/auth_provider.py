@@ -6,6 +6,7 @@ from httpx import URL, AsyncClient, BasicAuth, Response
 from injector import inject
 
 from trackline.core.settings import Settings
+from trackline.core.utils.http import create_timeout, create_transport
 
 
 @dataclass
@@ -15,7 +16,10 @@ class AccessToken:
 
     @property
     def is_expired(self) -> bool:
-        return self.expiration_time <= time.time()
+        return self.expires_within(0)
+
+    def expires_within(self, seconds: float) -> bool:
+        return self.expiration_time <= time.time() + seconds
 
 
 @dataclass
@@ -29,14 +33,18 @@ class InvalidTokenError(Exception):
 
 
 class SpotifyAuthProvider:
-    AUTHORIZATION_URL = "https://accounts.spotify.com/authorize"
-    TOKEN_URL = "https://accounts.spotify.com/api/token"  # noqa: S105
+    AUTHORIZATION_PATH = "/authorize"
+    TOKEN_PATH = "/api/token"  # noqa: S105
 
     @inject
     def __init__(self, settings: Settings) -> None:
         self._settings = settings
 
-        self._client = AsyncClient()
+        self._client = AsyncClient(
+            base_url=settings.spotify_accounts_url,
+            timeout=create_timeout(settings),
+            transport=create_transport(settings),
+        )
 
     async def close(self) -> None:
         await self._client.aclose()
@@ -47,7 +55,7 @@ class SpotifyAuthProvider:
             password=self._settings.spotify_client_secret,
         )
         response = await self._client.post(
-            self.TOKEN_URL,
+            self.TOKEN_PATH,
             auth=auth,
             data={"grant_type": "client_credentials"},
         )
@@ -61,12 +69,15 @@ class SpotifyAuthProvider:
             "response_type": "code",
             "redirect_uri": self._settings.spotify_redirect_url,
         }
-        url = URL(self.AUTHORIZATION_URL, params=params)
+        url = URL(
+            f"{self._settings.spotify_accounts_url}{self.AUTHORIZATION_PATH}",
+            params=params,
+        )
         return str(url)
 
     async def get_user_access_token(self, code: str) -> RefreshableAccessToken:
         response = await self._client.post(
-            self.TOKEN_URL,
+            self.TOKEN_PATH,
             data={
                 "grant_type": "authorization_code",
                 "code": code,
@@ -84,7 +95,7 @@ class SpotifyAuthProvider:
 
     async def refresh_access_token(self, refresh_token: str) -> RefreshableAccessToken:
         response = await self._client.post(
-            self.TOKEN_URL,
+            self.TOKEN_PATH,
             data={
                 "grant_type": "refresh_token",
                 "refresh_token": refresh_token,
@@ -0,0 +1,106 @@
+from typing import Any
+
+from httpx import AsyncBaseTransport, AsyncClient, Request, Response, TimeoutException
+from httpx_retries import Retry, RetryTransport
+from injector import inject
+
+from trackline.core.circuit_breaker import CircuitBreaker, CircuitBreakerTransport
+from trackline.core.deadline import (
+    DeadlineExceededError,
+    get_remaining_time,
+    is_deadline_exceeded,
+)
+from trackline.core.metrics import Metrics
+from trackline.core.settings import Settings
+from trackline.core.utils.http import create_timeout, create_transport
+from trackline.spotify.services.rate_limiter import (
+    RateLimitedTransport,
+    SpotifyRateLimiter,
+)
+
+
+class SpotifyHttpClient(AsyncClient):
+    """
+    HTTP client shared by all Spotify clients of the process, so that they reuse
+    the same connection pool. It holds no credentials, these are passed along with
+    each request instead.
+    """
+
+    @inject
+    def __init__(
+        self,
+        settings: Settings,
+        metrics: Metrics,
+        rate_limiter: SpotifyRateLimiter,
+    ) -> None:
+        super().__init__(
+            base_url=settings.spotify_api_url,
+            event_hooks={"request": [self._on_request]},
+            timeout=create_timeout(settings),
+            transport=CircuitBreakerTransport(
+                RetryTransport(
+                    # Retries pass the rate limiter as well
+                    transport=RateLimitedTransport(
+                        DeadlineTransport(
+                            create_transport(settings),
+                            min_timeout=settings.spotify_min_request_timeout / 1000,
+                        ),
+                        rate_limiter,
+                    ),
+                    retry=Retry(
+                        total=settings.spotify_retries_max_attempts,
+                        backoff_factor=settings.spotify_retries_min_interval / 1000,
+                    ),
+                ),
+                CircuitBreaker(
+                    "spotify",
+                    metrics,
+                    failure_threshold=settings.spotify_circuit_failure_threshold,
+                    reset_timeout=settings.spotify_circuit_reset_timeout / 1000,
+                ),
+            ),
+        )
+
+        self._settings = settings
+        self._metrics = metrics
+
+    async def _on_request(self, request: Request) -> None:
+        self._metrics.increment("spotify.requests")
+        request.extensions["trace"] = self._trace
+
+    async def _trace(self, event_name: str, info: dict[str, Any]) -> None:
+        # Requests sent over a pooled connection don't open a new one, so comparing
+        # both counters shows how well connections are reused
+        if event_name == "connection.connect_tcp.complete":
+            self._metrics.increment("spotify.connections")
+
+
+class DeadlineTransport(AsyncBaseTransport):
+    """
+    Transport that doesn't let a single request outlast the deadline of the current
+    context. Timeouts after the deadline has passed are raised as
+    DeadlineExceededError, so that they are reported like any other exceeded
+    deadline rather than as failed requests.
+    """
+
+    def __init__(self, transport: AsyncBaseTransport, min_timeout: float) -> None:
+        self._transport = transport
+        self._min_timeout = min_timeout
+
+    async def handle_async_request(self, request: Request) -> Response:
+        if (remaining_time := get_remaining_time()) is not None:
+            max_timeout = max(remaining_time, self._min_timeout)
+            request.extensions["timeout"] = {
+                key: max_timeout if value is None else min(value, max_timeout)
+                for key, value in request.extensions["timeout"].items()
+            }
+
+        try:
+            return await self._transport.handle_async_request(request)
+        except TimeoutException as e:
+            if is_deadline_exceeded():
+                raise DeadlineExceededError from e
+            raise
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
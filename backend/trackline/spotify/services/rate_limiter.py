@@ -0,0 +1,143 @@
+import asyncio
+import time
+
+from fastapi import status
+from httpx import AsyncBaseTransport, Request, Response
+from injector import inject
+
+from trackline.core.deadline import DeadlineExceededError, get_remaining_time
+from trackline.core.metrics import Metrics
+from trackline.core.settings import Settings
+
+
+class SpotifyRateLimiter:
+    """
+    Token bucket shared by all Spotify clients of the process.
+
+    The rate slowly increases while Spotify accepts requests and is halved
+    whenever it responds with 429. In that case, no request is sent at all until
+    the period given by the Retry-After header has passed, which is capped so that
+    a single response can't pause all requests for too long.
+    """
+
+    RATE_INCREASE = 0.1
+    RATE_DECREASE_FACTOR = 0.5
+
+    @inject
+    def __init__(self, settings: Settings, metrics: Metrics) -> None:
+        self._settings = settings
+        self._metrics = metrics
+
+        self._rate = float(settings.spotify_rate_limit_max)
+        self._tokens = float(settings.spotify_rate_limit_burst)
+        self._refill_time = time.monotonic()
+        self._lock = asyncio.Lock()
+        self._waiter_count = 0
+
+        self._metrics.set_gauge("spotify.rate_limit", self._rate)
+
+    @property
+    def rate(self) -> float:
+        """Current number of requests per second."""
+        return self._rate
+
+    async def acquire(self) -> None:
+        """
+        Wait for a token. Raises DeadlineExceededError right away if it is not
+        expected to be available before the deadline of the current context.
+        """
+        # Waiting callers are served in order, as they queue up on the lock, so each
+        # of them takes another token first
+        self._check_deadline(self._estimate_delay())
+        self._waiter_count += 1
+        try:
+            async with self._lock:
+                delay = self._take_token()
+                while delay > 0:
+                    # A 429 response may have postponed the refill in the meantime
+                    self._check_deadline(delay)
+                    await asyncio.sleep(delay)
+                    delay = self._take_token()
+        finally:
+            self._waiter_count -= 1
+
+    def on_response(self, response: Response) -> None:
+        if response.status_code != status.HTTP_429_TOO_MANY_REQUESTS:
+            self._set_rate(self._rate + self.RATE_INCREASE)
+            return
+
+        retry_after = self._parse_retry_after(response)
+        self._metrics.increment("spotify.throttled")
+        self._set_rate(self._rate * self.RATE_DECREASE_FACTOR)
+
+        # Pause all requests and start over with an empty bucket afterwards
+        self._tokens = 0
+        self._refill_time = max(self._refill_time, time.monotonic() + retry_after)
+
+    def _estimate_delay(self) -> float:
+        now = time.monotonic()
+        tokens = self._tokens + max(now - self._refill_time, 0) * self._rate
+        missing_tokens = (
+            self._waiter_count
+            + 1
+            - min(tokens, self._settings.spotify_rate_limit_burst)
+        )
+        return max(self._refill_time - now, 0) + max(missing_tokens, 0) / self._rate
+
+    def _check_deadline(self, delay: float) -> None:
+        remaining_time = get_remaining_time()
+        if remaining_time is not None and delay > remaining_time:
+            raise DeadlineExceededError
+
+    def _take_token(self) -> float:
+        now = time.monotonic()
+        if now < self._refill_time:
+            return self._refill_time - now
+
+        self._tokens = min(
+            self._tokens + (now - self._refill_time) * self._rate,
+            self._settings.spotify_rate_limit_burst,
+        )
+        self._refill_time = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0
+
+        return (1 - self._tokens) / self._rate
+
+    def _set_rate(self, rate: float) -> None:
+        self._rate = min(
+            max(rate, self._settings.spotify_rate_limit_min),
+            self._settings.spotify_rate_limit_max,
+        )
+        self._metrics.set_gauge("spotify.rate_limit", self._rate)
+
+    def _parse_retry_after(self, response: Response) -> float:
+        try:
+            retry_after = float(response.headers["Retry-After"])
+        except (KeyError, ValueError):
+            return self._settings.spotify_retries_min_interval / 1000
+
+        return min(
+            retry_after, self._settings.spotify_rate_limit_max_retry_after / 1000
+        )
+
+
+class RateLimitedTransport(AsyncBaseTransport):
+    def __init__(
+        self,
+        transport: AsyncBaseTransport,
+        rate_limiter: SpotifyRateLimiter,
+    ) -> None:
+        self._transport = transport
+        self._rate_limiter = rate_limiter
+
+    async def handle_async_request(self, request: Request) -> Response:
+        await self._rate_limiter.acquire()
+        response = await self._transport.handle_async_request(request)
+        self._rate_limiter.on_response(response)
+
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
@@ -0,0 +1,58 @@
+import json
+from collections.abc import Mapping
+from typing import Any
+
+from trackline.spotify.models import SpotifyTrack
+
+type JsonObject = Mapping[str, Any]
+
+# Fields of playlist items required by parse_track, which keeps responses small
+PLAYLIST_ITEMS_FIELDS = (
+    "items(track(id,is_playable,name,artists(name),album(release_date,images))),total"
+)
+
+
+def parse_tracks(content: bytes) -> list[SpotifyTrack | None]:
+    """Parse a response of the several-tracks endpoint."""
+    return [
+        parse_track(track) if track else None for track in json.loads(content)["tracks"]
+    ]
+
+
+def parse_playlist_items(content: bytes) -> tuple[list[SpotifyTrack | None], int]:
+    """
+    Parse a page of playlist items. Items that are no Spotify tracks, e.g. local
+    files, are returned as None.
+    """
+    body = json.loads(content)
+    tracks = [
+        parse_track(track) if (track := item["track"]) and track["id"] else None
+        for item in body["items"]
+    ]
+    return tracks, body["total"]
+
+
+def parse_track(track: JsonObject) -> SpotifyTrack:
+    album = track["album"]
+
+    try:
+        release_year = int(album["release_date"][:4])
+    except (TypeError, ValueError):
+        release_year = None
+
+    # Only the largest image is used, so there is no need to sort all of them
+    image = max(album["images"], key=_get_image_area, default=None)
+
+    # The values come straight from Spotify's schema, so validation is skipped
+    return SpotifyTrack.model_construct(
+        id=track["id"],
+        title=track["name"],
+        artists=[a["name"] for a in track["artists"]],
+        release_year=release_year,
+        is_playable=track.get("is_playable", True),
+        image_url=image["url"] if image else None,
+    )
+
+
+def _get_image_area(image: JsonObject) -> int:
+    return (image["height"] or 0) * (image["width"] or 0)
@@ -1,21 +1,34 @@
 import abc
 import asyncio
-from collections.abc import Sequence
+import logging
+from collections.abc import AsyncGenerator, Awaitable, Callable, Sequence
 from types import TracebackType
 from typing import Self
 
 from fastapi import status
-from httpx import AsyncClient
-from httpx_retries import Retry, RetryTransport
+from httpx import Auth, Request, Response
 from injector import inject
 
 from trackline.core.settings import Settings
-from trackline.spotify.models import SpotifyProduct, SpotifyTrack, SpotifyUser
+from trackline.spotify.models import (
+    SpotifyPlaylist,
+    SpotifyProduct,
+    SpotifyTrack,
+    SpotifyUser,
+)
 from trackline.spotify.services.auth_provider import (
     AccessToken,
     RefreshableAccessToken,
     SpotifyAuthProvider,
 )
+from trackline.spotify.services.http_client import SpotifyHttpClient
+from trackline.spotify.services.response_parser import (
+    PLAYLIST_ITEMS_FIELDS,
+    parse_playlist_items,
+    parse_tracks,
+)
+
+log = logging.getLogger(__name__)
 
 
 class InvalidTokenError(Exception):
@@ -29,68 +42,89 @@ class PlaylistNotFoundError(Exception):
         self.playlist_id = playlist_id
 
 
+class TrackNotFoundError(Exception):
+    def __init__(self, track_id: str) -> None:
+        super().__init__(f"The track {track_id} was not found")
+        self.track_id = track_id
+
+
+class BearerTokenAuth(Auth):
+    def __init__(self, get_access_token: Callable[[], Awaitable[AccessToken]]) -> None:
+        self._get_access_token = get_access_token
+
+    async def async_auth_flow(
+        self, request: Request
+    ) -> AsyncGenerator[Request, Response]:
+        access_token = await self._get_access_token()
+        request.headers["Authorization"] = f"Bearer {access_token.access_token}"
+        yield request
+
+
 class SpotifyClientBase(abc.ABC):
     MAX_LIMIT = 50
 
     @inject
-    def __init__(self, settings: Settings, auth_provider: SpotifyAuthProvider) -> None:
+    def __init__(
+        self,
+        settings: Settings,
+        auth_provider: SpotifyAuthProvider,
+        http_client: SpotifyHttpClient,
+    ) -> None:
         self._settings = settings
         self._auth_provider = auth_provider
+        self._client = http_client
 
-        self._client = AsyncClient(
-            base_url="https://api.spotify.com/v1",
-            transport=RetryTransport(
-                retry=Retry(
-                    total=settings.spotify_retries_max_attempts,
-                    backoff_factor=settings.spotify_retries_min_interval / 1000,
-                )
-            ),
-        )
-
-    async def close(self) -> None:
-        await self._client.aclose()
-
-    async def get_track(self, track_id: str) -> SpotifyTrack:
-        await self._ensure_access_token()
-
-        response = await self._client.get(f"/tracks/{track_id}")
-        response.raise_for_status()
+        # Concurrent callers wait for a single refresh of an expired token
+        self._token_lock = asyncio.Lock()
+        self._auth = BearerTokenAuth(self._get_access_token)
 
-        track = response.json()
-        release_date = track["album"]["release_date"]
-        is_playable = track.get("is_playable", True)
+    async def get_track(
+        self,
+        track_id: str,
+        market: str | None = None,
+    ) -> SpotifyTrack:
+        [track] = await self.get_tracks([track_id], market=market)
+        if not track:
+            raise TrackNotFoundError(track_id)
 
-        try:
-            release_year = int(release_date[:4])
-        except (TypeError, IndexError, ValueError):
-            release_year = None
+        return track
 
-        images = sorted(
-            track["album"]["images"],
-            key=lambda x: x["height"] * x["width"],
-            reverse=True,
+    async def get_tracks(
+        self,
+        track_ids: Sequence[str],
+        market: str | None = None,
+    ) -> list[SpotifyTrack | None]:
+        """
+        Get multiple tracks in batches of up to 50 ids. Tracks unknown to Spotify
+        are returned as None. The tracks are not cached, SpotifyTrackStore should be
+        used instead wherever a request scope is available.
+        """
+        unique_track_ids = list(dict.fromkeys(track_ids))
+        chunks = [
+            unique_track_ids[i : i + self.MAX_LIMIT]
+            for i in range(0, len(unique_track_ids), self.MAX_LIMIT)
+        ]
+        fetched_chunks = await asyncio.gather(
+            *(self._fetch_tracks(chunk, market) for chunk in chunks)
         )
+        tracks = {
+            track_id: track
+            for chunk, chunk_tracks in zip(chunks, fetched_chunks, strict=True)
+            for track_id, track in zip(chunk, chunk_tracks, strict=True)
+        }
 
-        return SpotifyTrack(
-            id=track["id"],
-            title=track["name"],
-            artists=[a["name"] for a in track["artists"]],
-            release_year=release_year,
-            is_playable=is_playable,
-            image_url=images[0]["url"] if images else None,
-        )
+        return [tracks[track_id] for track_id in track_ids]
 
-    async def get_playlist_total_tracks(
+    async def get_playlist(
         self,
         playlist_id: str,
         market: str | None = None,
-    ) -> int:
-        await self._ensure_access_token()
-
+    ) -> SpotifyPlaylist:
         response = await self._client.get(
             f"playlists/{playlist_id}",
+            auth=self._auth,
             params={
-                "fields": "tracks.total",
+                "fields": "id,snapshot_id,tracks.total",
                 "market": market,
             },
         )
@@ -99,7 +133,19 @@ class SpotifyClientBase(abc.ABC):
         response.raise_for_status()
 
         playlist = response.json()
-        return playlist["tracks"]["total"]
+        return SpotifyPlaylist(
+            id=playlist["id"],
+            snapshot_id=playlist["snapshot_id"],
+            track_count=playlist["tracks"]["total"],
+        )
+
+    async def get_playlist_total_tracks(
+        self,
+        playlist_id: str,
+        market: str | None = None,
+    ) -> int:
+        playlist = await self.get_playlist(playlist_id, market=market)
+        return playlist.track_count
 
     async def get_playlist_tracks(
         self,
@@ -108,69 +154,45 @@ class SpotifyClientBase(abc.ABC):
         limit: int | None = None,
         market: str | None = None,
     ) -> list[SpotifyTrack]:
-        await self._ensure_access_token()
-
         tracks: list[SpotifyTrack] = []
         while True:
-            response = await self._client.get(
-                f"playlists/{playlist_id}/items",
-                params={
-                    "fields": (
-                        "items(track(id,is_playable,name,artists(name),album(release_date,images))),"
-                        "total"
-                    ),
-                    "offset": str(offset),
-                    "limit": str(limit - len(tracks) if limit else self.MAX_LIMIT),
-                    "market": market,
-                },
+            items, total = await self._get_playlist_items(
+                playlist_id,
+                offset=offset,
+                limit=limit - len(tracks) if limit else self.MAX_LIMIT,
+                market=market,
             )
-            response.raise_for_status()
-
-            response_body = response.json()
-            items = response_body["items"]
             if not items:
                 break
 
-            for item in items:
-                track = item["track"]
-                if track["id"] is None:
-                    continue
-
-                release_date = track["album"]["release_date"]
-                is_playable = track.get("is_playable", True)
-
-                try:
-                    release_year = int(release_date[:4])
-                except (TypeError, IndexError, ValueError):
-                    release_year = None
-
-                images = sorted(
-                    track["album"]["images"],
-                    key=lambda x: x["height"] * x["width"],
-                    reverse=True,
-                )
-
-                tracks.append(
-                    SpotifyTrack(
-                        id=track["id"],
-                        title=track["name"],
-                        artists=[a["name"] for a in track["artists"]],
-                        release_year=release_year,
-                        is_playable=is_playable,
-                        image_url=images[0]["url"] if images else None,
-                    ),
-                )
-
+            tracks += (track for track in items if track)
             offset += len(items)
 
-            total = response_body["total"]
             if total <= len(tracks) or (limit and limit <= len(tracks)):
                 break
 
-            await self._sleep_throttle_time()
-
         return tracks
 
+    async def get_playlist_page(
+        self,
+        playlist_id: str,
+        offset: int = 0,
+        market: str | None = None,
+    ) -> list[SpotifyTrack | None]:
+        """
+        Fetch a single page of playlist items starting at the given offset.
+
+        The position of each item is preserved, items without a track id are
+        returned as `None`.
+        """
+        items, _ = await self._get_playlist_items(
+            playlist_id,
+            offset=offset,
+            limit=self.MAX_LIMIT,
+            market=market,
+        )
+        return items
+
     async def get_playlist_track(
         self,
         playlist_id: str,
@@ -185,28 +207,49 @@ class SpotifyClientBase(abc.ABC):
         )
         return tracks[0] if tracks else None
 
-    async def __aenter__(self) -> Self:
-        return self
+    async def _get_playlist_items(
+        self,
+        playlist_id: str,
+        offset: int,
+        limit: int,
+        market: str | None,
+    ) -> tuple[list[SpotifyTrack | None], int]:
+        response = await self._client.get(
+            f"playlists/{playlist_id}/items",
+            auth=self._auth,
+            params={
+                "fields": PLAYLIST_ITEMS_FIELDS,
+                "offset": str(offset),
+                "limit": str(limit),
+                "market": market,
+            },
+        )
+        response.raise_for_status()
 
-    async def __aexit__(
+        return parse_playlist_items(response.content)
+
+    async def _fetch_tracks(
         self,
-        type_: type[BaseException] | None,
-        value: BaseException | None,
-        traceback: TracebackType | None,
-    ) -> None:
-        await self.close()
+        track_ids: Sequence[str],
+        market: str | None,
+    ) -> list[SpotifyTrack | None]:
+        response = await self._client.get(
+            "tracks",
+            auth=self._auth,
+            params={
+                "ids": ",".join(track_ids),
+                "market": market,
+            },
+        )
+        response.raise_for_status()
 
-    async def _ensure_access_token(self) -> None:
-        access_token = await self._get_access_token()
-        self._client.headers["Authorization"] = f"Bearer {access_token.access_token}"
+        # Tracks are returned in the order of the given ids, unknown ones as null
+        return parse_tracks(response.content)
 
     @abc.abstractmethod
     async def _get_access_token(self) -> AccessToken:
         raise NotImplementedError
 
-    async def _sleep_throttle_time(self) -> None:
-        await asyncio.sleep(self._settings.spotify_throttle_time / 1000)
-
 
 class SpotifyClient(SpotifyClientBase):
     @inject
@@ -214,16 +257,58 @@ class SpotifyClient(SpotifyClientBase):
         self,
         settings: Settings,
         auth_provider: SpotifyAuthProvider,
+        http_client: SpotifyHttpClient,
     ) -> None:
-        super().__init__(settings, auth_provider)
+        super().__init__(settings, auth_provider, http_client)
 
         self._access_token: AccessToken | None = None
+        self._renewal_task: asyncio.Task[AccessToken] | None = None
+
+    async def close(self) -> None:
+        if renewal_task := self._renewal_task:
+            renewal_task.cancel()
+            await asyncio.wait((renewal_task,))
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        type_: type[BaseException] | None,
+        value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.close()
 
     async def _get_access_token(self) -> AccessToken:
-        if not self._access_token or self._access_token.is_expired:
+        access_token = self._access_token
+        if not access_token or access_token.is_expired:
+            return await self._renew_access_token()
+
+        # Renew the token in the background shortly before it expires, so that no
+        # request has to wait for it
+        renewal_margin = self._settings.spotify_token_renewal_margin / 1000
+        if access_token.expires_within(renewal_margin) and not self._renewal_task:
+            self._renewal_task = asyncio.create_task(self._renew_access_token())
+            self._renewal_task.add_done_callback(self._on_renewal_done)
+
+        return access_token
+
+    async def _renew_access_token(self) -> AccessToken:
+        async with self._token_lock:
+            renewal_margin = self._settings.spotify_token_renewal_margin / 1000
+            if self._access_token and not self._access_token.expires_within(
+                renewal_margin
+            ):
+                return self._access_token
+
             self._access_token = await self._auth_provider.get_server_access_token()
+            return self._access_token
 
-        return self._access_token
+    def _on_renewal_done(self, task: asyncio.Task[AccessToken]) -> None:
+        self._renewal_task = None
+        if not task.cancelled() and (e := task.exception()):
+            log.warning("Failed to renew Spotify access token", exc_info=e)
 
 
 class SpotifyUserClient(SpotifyClientBase):
@@ -232,16 +317,15 @@ class SpotifyUserClient(SpotifyClientBase):
         self,
         settings: Settings,
         auth_provider: SpotifyAuthProvider,
+        http_client: SpotifyHttpClient,
         access_token: RefreshableAccessToken,
     ) -> None:
-        super().__init__(settings, auth_provider)
+        super().__init__(settings, auth_provider, http_client)
 
         self._access_token = access_token
 
     async def get_current_user(self) -> SpotifyUser:
-        await self._ensure_access_token()
-
-        response = await self._client.get("me")
+        response = await self._client.get("me", auth=self._auth)
         response.raise_for_status()
 
         user = response.json()
@@ -258,13 +342,12 @@ class SpotifyUserClient(SpotifyClientBase):
         """
         Remove multiple tracks from a Spotify playlist in batches of up to 100 items.
         """
-        await self._ensure_access_token()
-
         for i in range(0, len(track_ids), self.MAX_LIMIT):
             track_ids_chunk = track_ids[i : i + self.MAX_LIMIT]
             response = await self._client.request(
                 "DELETE",
                 f"playlists/{playlist_id}/items",
+                auth=self._auth,
                 data={
                     "tracks": [
                         {"uri": f"spotify:track:{track_id}"}
@@ -274,16 +357,18 @@ class SpotifyUserClient(SpotifyClientBase):
             )
             response.raise_for_status()
 
-            await self._sleep_throttle_time()
-
     async def _get_access_token(self) -> RefreshableAccessToken:
-        if self._access_token.is_expired:
-            refresh_token = self._access_token.refresh_token
-            if not refresh_token:
-                raise InvalidTokenError
+        if not self._access_token.is_expired:
+            return self._access_token
 
-            self._access_token = await self._auth_provider.refresh_access_token(
-                refresh_token
-            )
+        async with self._token_lock:
+            if self._access_token.is_expired:
+                refresh_token = self._access_token.refresh_token
+                if not refresh_token:
+                    raise InvalidTokenError
+
+                self._access_token = await self._auth_provider.refresh_access_token(
+                    refresh_token
+                )
 
         return self._access_token
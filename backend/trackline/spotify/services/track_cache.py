@@ -0,0 +1,131 @@
+from collections.abc import Collection, Mapping, Sequence
+
+from injector import inject
+
+from trackline.core.db.repository import Repository
+from trackline.core.settings import Settings
+from trackline.core.utils.cache import LruCache
+from trackline.core.utils.datetime import utcnow
+from trackline.spotify.models import CachedSpotifyTrack, SpotifyTrack
+from trackline.spotify.services.spotify_client import SpotifyClient
+
+type Key = tuple[str, str | None]
+
+
+class SpotifyTrackCache:
+    """
+    In-memory cache of Spotify tracks by id and market, as their playability depends
+    on the market. Unknown tracks are cached as None.
+    """
+
+    @inject
+    def __init__(self, settings: Settings) -> None:
+        self._entries = LruCache[Key, SpotifyTrack | None](
+            settings.spotify_track_cache_max_size,
+            ttl=settings.spotify_track_cache_ttl / 1000,
+        )
+
+    def get(self, key: Key) -> SpotifyTrack | None:
+        return self._entries.get(key)
+
+    def set(self, key: Key, track: SpotifyTrack | None) -> None:
+        self._entries.set(key, track)
+
+
+class SpotifyTrackStore:
+    """
+    Fetches Spotify tracks through the in-memory cache and a database collection
+    with TTL expiry, which is shared between processes and survives restarts.
+    """
+
+    @inject
+    def __init__(
+        self,
+        repository: Repository,
+        cache: SpotifyTrackCache,
+        spotify_client: SpotifyClient,
+    ) -> None:
+        self._repository = repository
+        self._cache = cache
+        self._spotify_client = spotify_client
+
+    async def get_tracks(
+        self,
+        track_ids: Sequence[str],
+        market: str | None = None,
+    ) -> list[SpotifyTrack | None]:
+        """
+        Get multiple tracks, fetching the ones that are not cached from Spotify.
+        Tracks unknown to Spotify are returned as None.
+        """
+        tracks = await self.get_many(track_ids, market=market)
+
+        missing_track_ids = [t for t in dict.fromkeys(track_ids) if t not in tracks]
+        if missing_track_ids:
+            fetched_tracks = dict(
+                zip(
+                    missing_track_ids,
+                    await self._spotify_client.get_tracks(
+                        missing_track_ids, market=market
+                    ),
+                    strict=True,
+                )
+            )
+            await self.set_many(fetched_tracks, market=market)
+            tracks.update(fetched_tracks)
+
+        return [tracks[track_id] for track_id in track_ids]
+
+    async def get_many(
+        self,
+        track_ids: Collection[str],
+        market: str | None = None,
+    ) -> dict[str, SpotifyTrack | None]:
+        tracks: dict[str, SpotifyTrack | None] = {}
+        missing_track_ids: list[str] = []
+        for track_id in track_ids:
+            try:
+                tracks[track_id] = self._cache.get((track_id, market))
+            except KeyError:
+                missing_track_ids.append(track_id)
+
+        if missing_track_ids:
+            cached_tracks = await self._repository.get_many(
+                CachedSpotifyTrack,
+                {
+                    "track_spotify_id": {"$in": missing_track_ids},
+                    "market": market,
+                },
+            )
+            for cached_track in cached_tracks:
+                self._cache.set(
+                    (cached_track.track_spotify_id, market), cached_track.track
+                )
+                tracks[cached_track.track_spotify_id] = cached_track.track
+
+        return tracks
+
+    async def set_many(
+        self,
+        tracks: Mapping[str, SpotifyTrack | None],
+        market: str | None = None,
+    ) -> None:
+        creation_time = utcnow()
+        await self._repository.bulk_upsert(
+            CachedSpotifyTrack,
+            (
+                (
+                    {"track_spotify_id": track_id, "market": market},
+                    {
+                        "$set": {
+                            "track": track.model_dump() if track else None,
+                            "creation_time": creation_time,
+                        }
+                    },
+                )
+                for track_id, track in tracks.items()
+            ),
+        )
+
+        for track_id, track in tracks.items():
+            self._cache.set((track_id, market), track)
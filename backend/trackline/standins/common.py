@@ -0,0 +1,50 @@
+import asyncio
+import random
+import zlib
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from fastapi import FastAPI, Request, Response, status
+from fastapi.responses import JSONResponse
+
+
+@dataclass(frozen=True)
+class StandInBehavior:
+    # Mean latency of responses in ms, which varies by the given jitter in ms
+    latency: float = 0
+    jitter: float = 0
+    # Fractions of requests that fail with 500 or are throttled with 429
+    error_rate: float = 0
+    throttle_rate: float = 0
+    # Value of the Retry-After header of throttled responses in seconds
+    retry_after: int = 1
+
+
+def get_seed(*values: object) -> int:
+    """Stable seed, so that stand-ins return the same data across restarts."""
+    return zlib.crc32(":".join(map(str, values)).encode())
+
+
+def add_behavior(app: FastAPI, behavior: StandInBehavior) -> None:
+    @app.middleware("http")
+    async def emulate_behavior(
+        request: Request,
+        call_next: Callable[[Request], Awaitable[Response]],
+    ) -> Response:
+        latency = behavior.latency + random.uniform(-1, 1) * behavior.jitter  # noqa: S311
+        await asyncio.sleep(max(latency, 0) / 1000)
+
+        value = random.random()  # noqa: S311
+        if value < behavior.throttle_rate:
+            return JSONResponse(
+                {"error": {"status": 429, "message": "API rate limit exceeded"}},
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                headers={"Retry-After": str(behavior.retry_after)},
+            )
+        if value < behavior.throttle_rate + behavior.error_rate:
+            return JSONResponse(
+                {"error": {"status": 500, "message": "Server error"}},
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+        return await call_next(request)
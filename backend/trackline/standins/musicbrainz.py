@@ -0,0 +1,51 @@
+"""
+Stand-in for the recording search of MusicBrainz. It returns recordings for the
+quoted terms of the query, so that lookups of tracks of the Spotify stand-in
+find matching recordings with release years derived from their titles.
+"""
+
+import random
+import re
+from itertools import permutations
+from typing import Any
+
+from fastapi import FastAPI
+
+from trackline.standins.common import StandInBehavior, add_behavior, get_seed
+
+TERM_PATTERN = re.compile(r'(?<![:\w])"((?:[^"\\]|\\.)*)"')
+ESCAPE_PATTERN = re.compile(r"\\(.)")
+
+
+def create_musicbrainz_app(behavior: StandInBehavior) -> FastAPI:
+    app = FastAPI(title="MusicBrainz stand-in")
+    add_behavior(app, behavior)
+
+    @app.get("/ws/2/recording")
+    def get_recordings(query: str, limit: int = 25) -> dict[str, Any]:
+        # Terms of fields, e.g. comments, are ignored. As the role of the others is
+        # unknown, recordings are returned for each pair of title and artist.
+        terms = [ESCAPE_PATTERN.sub(r"\1", t) for t in TERM_PATTERN.findall(query)]
+        recordings = [
+            _generate_recording(title, artist)
+            for title, artist in permutations(dict.fromkeys(terms), 2)
+        ]
+        return {"recordings": recordings[:limit]}
+
+    return app
+
+
+def _generate_recording(title: str, artist: str) -> dict[str, Any]:
+    rng = random.Random(get_seed(title, artist))  # noqa: S311
+    return {
+        "id": f"{rng.getrandbits(64):016x}",
+        "score": 100,
+        "title": title,
+        "artist-credit": [
+            {
+                "name": artist,
+                "artist": {"id": f"{get_seed(artist):08x}", "name": artist},
+            }
+        ],
+        "first-release-date": f"{rng.randint(1950, 2025)}-01-01",
+    }
@@ -0,0 +1,95 @@
+"""
+Stand-in for the Spotify endpoints used by Trackline, which serves generated
+playlists. Playlists and tracks are derived from their ids, so any playlist id
+can be requested and track ids stay valid across restarts.
+"""
+
+import random
+from typing import Annotated, Any
+
+from fastapi import FastAPI, Form, HTTPException, Query, status
+
+from trackline.standins.common import StandInBehavior, add_behavior, get_seed
+
+# Fractions of generated tracks that can't be used in games
+UNPLAYABLE_TRACK_RATE = 0.03
+MISSING_RELEASE_DATE_RATE = 0.02
+ARTIST_COUNT = 500
+MAX_TRACK_IDS = 50
+
+
+def create_spotify_app(
+    behavior: StandInBehavior,
+    playlist_size: int = 1000,
+) -> FastAPI:
+    app = FastAPI(title="Spotify stand-in")
+    add_behavior(app, behavior)
+
+    @app.post("/api/token")
+    def get_token(
+        grant_type: Annotated[str, Form()],
+    ) -> dict[str, Any]:
+        token: dict[str, Any] = {
+            "access_token": f"standin-{grant_type}",
+            "token_type": "Bearer",
+            "expires_in": 3600,
+        }
+        if grant_type == "authorization_code":
+            token["refresh_token"] = "standin-refresh-token"  # noqa: S105
+        return token
+
+    @app.get("/v1/playlists/{playlist_id}")
+    def get_playlist(playlist_id: str) -> dict[str, Any]:
+        return {
+            "id": playlist_id,
+            "snapshot_id": f"standin-{playlist_id}",
+            "tracks": {"total": playlist_size},
+        }
+
+    @app.get("/v1/playlists/{playlist_id}/items")
+    def get_playlist_items(
+        playlist_id: str,
+        offset: int = 0,
+        limit: Annotated[int, Query(le=MAX_TRACK_IDS)] = 20,
+    ) -> dict[str, Any]:
+        end = min(offset + limit, playlist_size)
+        return {
+            "items": [
+                {"track": _generate_track(f"{playlist_id}-{index}")}
+                for index in range(offset, end)
+            ],
+            "total": playlist_size,
+        }
+
+    @app.get("/v1/tracks")
+    def get_tracks(ids: str) -> dict[str, Any]:
+        track_ids = ids.split(",")
+        if len(track_ids) > MAX_TRACK_IDS:
+            raise HTTPException(status.HTTP_400_BAD_REQUEST, "Too many ids requested")
+
+        return {"tracks": [_generate_track(track_id) for track_id in track_ids]}
+
+    return app
+
+
+def _generate_track(track_id: str) -> dict[str, Any]:
+    rng = random.Random(get_seed(track_id))  # noqa: S311
+    release_year = rng.randint(1950, 2025)
+    has_release_date = rng.random() >= MISSING_RELEASE_DATE_RATE
+
+    return {
+        "id": track_id,
+        "name": f"Song {track_id}",
+        "artists": [{"name": f"Artist {rng.randrange(ARTIST_COUNT)}"}],
+        "is_playable": rng.random() >= UNPLAYABLE_TRACK_RATE,
+        "album": {
+            "release_date": f"{release_year}-01-01" if has_release_date else None,
+            "images": [
+                {
+                    "url": f"https://picsum.photos/seed/{track_id}/640",
+                    "height": 640,
+                    "width": 640,
+                }
+            ],
+        },
+    }
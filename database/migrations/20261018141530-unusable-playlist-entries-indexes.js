@@ -0,0 +1,30 @@
+module.exports = {
+  /**
+   * @param db {import('mongodb').Db}
+   * @param client {import('mongodb').MongoClient}
+   * @returns {Promise<void>}
+   */
+  async up(db, client) {
+    await db.collection("unusable_playlist_entries").createIndex(
+      { playlist_spotify_id: 1, snapshot_id: 1, market: 1 },
+      { name: "playlist_snapshot_id_index", unique: true },
+    );
+
+    await db.collection("unusable_playlist_entries").createIndex(
+      { creation_time: 1 },
+      {
+        name: "creation_time_ttl",
+        expireAfterSeconds: 30 * 24 * 60 * 60, // 30 days
+      },
+    );
+  },
+
+  /**
+   * @param db {import('mongodb').Db}
+   * @param client {import('mongodb').MongoClient}
+   * @returns {Promise<void>}
+   */
+  async down(db, client) {
+    await db.collection("unusable_playlist_entries").drop();
+  },
+};
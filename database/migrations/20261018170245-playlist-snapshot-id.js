@@ -0,0 +1,35 @@
+module.exports = {
+  /**
+   * @param db {import('mongodb').Db}
+   * @param client {import('mongodb').MongoClient}
+   * @returns {Promise<void>}
+   */
+  async up(db, client) {
+    await db.collection("game").updateMany(
+      {
+        "settings.playlists.snapshot_id": { $exists: false },
+      },
+      {
+        $set: {
+          "settings.playlists.$[].snapshot_id": null,
+        },
+      },
+    );
+  },
+
+  /**
+   * @param db {import('mongodb').Db}
+   * @param client {import('mongodb').MongoClient}
+   * @returns {Promise<void>}
+   */
+  async down(db, client) {
+    await db.collection("game").updateMany(
+      {},
+      {
+        $unset: {
+          "settings.playlists.$[].snapshot_id": "",
+        },
+      },
+    );
+  },
+};
@@ -0,0 +1,30 @@
+module.exports = {
+  /**
+   * @param db {import('mongodb').Db}
+   * @param client {import('mongodb').MongoClient}
+   * @returns {Promise<void>}
+   */
+  async up(db, client) {
+    await db.collection("spotify_track_cache").createIndex(
+      { track_spotify_id: 1, market: 1 },
+      { name: "track_spotify_id_market_index", unique: true },
+    );
+
+    await db.collection("spotify_track_cache").createIndex(
+      { creation_time: 1 },
+      {
+        name: "creation_time_ttl",
+        expireAfterSeconds: 7 * 24 * 60 * 60, // 7 days
+      },
+    );
+  },
+
+  /**
+   * @param db {import('mongodb').Db}
+   * @param client {import('mongodb').MongoClient}
+   * @returns {Promise<void>}
+   */
+  async down(db, client) {
+    await db.collection("spotify_track_cache").drop();
+  },
+};
@@ -0,0 +1,30 @@
+module.exports = {
+  /**
+   * @param db {import('mongodb').Db}
+   * @param client {import('mongodb').MongoClient}
+   * @returns {Promise<void>}
+   */
+  async up(db, client) {
+    await db.collection("release_year_cache").createIndex(
+      { key: 1, version: 1 },
+      { name: "key_version_index", unique: true },
+    );
+
+    await db.collection("release_year_cache").createIndex(
+      { creation_time: 1 },
+      {
+        name: "creation_time_ttl",
+        expireAfterSeconds: 90 * 24 * 60 * 60, // 90 days
+      },
+    );
+  },
+
+  /**
+   * @param db {import('mongodb').Db}
+   * @param client {import('mongodb').MongoClient}
+   * @returns {Promise<void>}
+   */
+  async down(db, client) {
+    await db.collection("release_year_cache").drop();
+  },
+};
@@ -66,6 +66,14 @@ export const trackExchanged = createAction<TrackExchangedPayload>(
   `${PREFIX}/trackExchanged`,
 );
 
+interface TrackUpdatedPayload {
+  turnRevisionId: string;
+  track: Track;
+}
+export const trackUpdated = createAction<TrackUpdatedPayload>(
+  `${PREFIX}/trackUpdated`,
+);
+
 interface ReleaseYearGuessCreatedPayload {
   guess: ReleaseYearGuess;
 }
@@ -34,6 +34,7 @@ import {
   releaseYearGuessCreated,
   trackBought,
   trackExchanged,
+  trackUpdated,
   turnCompleted,
   turnCreated,
   turnPassed,
@@ -217,6 +218,13 @@ const reducer = createReducer(initialState, (builder) => {
       removeGameFromActive(state);
     })
 
+    .addCase(trackUpdated, (state, { payload: { turnRevisionId, track } }) => {
+      const turn = getCurrentTurn(state);
+      if (turn.revisionId === turnRevisionId) {
+        turn.track = track;
+      }
+    })
+
     .addCase(fetchActiveGames.fulfilled, (state, { payload: { games } }) => {
       state.activeGames = games;
     })
@@ -19,6 +19,7 @@ import {
   releaseYearGuessCreated,
   trackBought,
   trackExchanged,
+  trackUpdated,
   turnCompleted,
   turnCreated,
   turnPassed,
@@ -35,6 +36,7 @@ const actionsByType: Record<string, ActionCreator<Action> | undefined> = {
   release_year_guess_created: releaseYearGuessCreated,
   credits_guess_created: creditsGuessCreated,
   track_exchanged: trackExchanged,
+  track_updated: trackUpdated,
   turn_passed: turnPassed,
   turn_completed: turnCompleted,
   turn_scored: turnScored,